@@ -7,6 +7,12 @@ from pathlib import Path
 
 import requests
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from ui.yunxiao.YunxiaoApi import DEFAULT_TIMEOUT, api_headers, create_client  # noqa: E402
+
 # 复用 JRocket 现有的云效个人访问令牌（PAT）。
 TOKEN_FILE = Path(__file__).parents[2] / "ui" / "yunxiao" / "yunxiaotoken.txt"
 ACCESS_TOKEN = TOKEN_FILE.read_text(encoding="utf-8").strip()
@@ -23,10 +29,7 @@ def list_repositories(session: requests.Session) -> list[dict]:
     while True:
         response = session.get(
             f"{API_BASE_URL}/oapi/v1/codeup/repositories",
-            headers={
-                "Content-Type": "application/json",
-                "x-yunxiao-token": ACCESS_TOKEN,
-            },
+            headers=api_headers(ACCESS_TOKEN),
             params={
                 "page": page,
                 "perPage": PER_PAGE,
@@ -34,7 +37,7 @@ def list_repositories(session: requests.Session) -> list[dict]:
                 "sort": "asc",
                 "archived": "false",
             },
-            timeout=30,
+            timeout=DEFAULT_TIMEOUT,
         )
         response.raise_for_status()
         batch = response.json()
@@ -57,7 +60,7 @@ def export_repositories() -> None:
     if not ACCESS_TOKEN:
         sys.exit("请先在脚本顶部填写 ACCESS_TOKEN。")
 
-    with requests.Session() as session:
+    with create_client() as session:
         repositories = list_repositories(session)
 
     rows = [
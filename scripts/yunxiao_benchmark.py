@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the Yunxiao helpers in ui/yunxiao.
+
+Usage:
+  python3 scripts/yunxiao_benchmark.py [name...]
+
+Without arguments every benchmark runs. Only Qt-free modules are imported,
+so this works without PyQt5 or requests installed.
+"""
+
+import os
+import random
+import re
+import sys
+import time
+from contextlib import contextmanager
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from ui.yunxiao import MappingIndex as mapping_index_module  # noqa: E402
+from ui.yunxiao.AcrImageLog import parse_acr_log  # noqa: E402
+from ui.yunxiao import YunxiaoUrls  # noqa: E402
+from ui.yunxiao.MappingIndex import MappingIndex  # noqa: E402
+from ui.yunxiao.PayloadWalk import find_run_id, iter_strings, pipeline_children, walk  # noqa: E402
+
+
+ORG_URL = "https://sovell-cn-shanghai.devops.aliyuncs.com"
+URL_FUNCTIONS = (
+    "normalize_remote_url",
+    "normalize_yunxiao_codeup_url",
+    "normalize_for_match",
+    "repo_path_from_remote",
+    "repo_name_from_text",
+)
+
+
+def best_of(func, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def report(name, baseline, optimized):
+    print(f"{name}: before {baseline * 1000:.2f} ms, after {optimized * 1000:.2f} ms, x{baseline / optimized:.1f}")
+
+
+def realistic_mappings(repo_count=200, pipeline_count=300, seed=7):
+    rng = random.Random(seed)
+    groups = ["intell-menu", "sovell-pay", "sovell-mall", "sovell-base", "devops"]
+    repos = []
+    for index in range(repo_count):
+        group = rng.choice(groups)
+        name = f"sovell-{group.split('-')[-1]}-service-{index}"
+        remote = rng.choice(
+            [
+                f"{ORG_URL}/codeup/sovell/{group}/{name}.git",
+                f"{ORG_URL}/codeup/{group}/{name}.git",
+                f"git@sovell-cn-shanghai.devops.aliyuncs.com:sovell/{group}/{name}.git",
+            ]
+        )
+        repos.append({"repo_name": name, "remote_url": remote})
+    automatic = []
+    for index in range(pipeline_count):
+        repo = repos[index % repo_count]
+        key = YunxiaoUrls.normalize_yunxiao_codeup_url.__wrapped__(repo["remote_url"])
+        automatic.append(
+            {
+                "key": key,
+                "repo_name": repo["repo_name"],
+                "pipeline_id": str(1390000 + index),
+                "pipeline_name": f"{repo['repo_name']}-{index}",
+            }
+        )
+    manual = [{"key": f"{repos[index]['repo_name']}.git", "pipeline_id": str(1397900 + index)} for index in range(20)]
+    return repos, manual, automatic
+
+
+@contextmanager
+def uncached_urls():
+    """Temporarily swap the memoized URL helpers for their plain versions."""
+    plain = {name: getattr(YunxiaoUrls, name).__wrapped__ for name in URL_FUNCTIONS}
+    saved = []
+    for module in (YunxiaoUrls, mapping_index_module):
+        for name in URL_FUNCTIONS:
+            if hasattr(module, name):
+                saved.append((module, name, getattr(module, name)))
+                setattr(module, name, plain[name])
+    try:
+        yield
+    finally:
+        for module, name, func in saved:
+            setattr(module, name, func)
+
+
+def bench_urls():
+    repos, manual, automatic = realistic_mappings()
+
+    def workload():
+        # 一次扫描、一次分支执行和一次映射刷新各自构建索引并匹配全部仓库
+        for _ in range(3):
+            index = MappingIndex(manual, automatic)
+            for repo in repos:
+                index.match(repo["remote_url"], repo["repo_name"])
+            for mapping in automatic:
+                YunxiaoUrls.normalize_for_match(mapping["key"])
+
+    with uncached_urls():
+        baseline = best_of(workload)
+    workload()
+    optimized = best_of(workload)
+    report(f"urls ({len(repos)} repos x {len(automatic)} mappings)", baseline, optimized)
+
+
+def synthetic_build_log(size_mb=50, seed=11):
+    rng = random.Random(seed)
+    filler = [
+        "#12 [stage 3/7] RUN mvn -B package -DskipTests",
+        "Downloading from central: https://maven.aliyun.com/repository/public/org/apache/commons/commons-lang3/3.12.0/commons-lang3-3.12.0.jar",
+        "[INFO] Building jar: /root/workspace/target/sovell-demeter-5.0.20.jar",
+        "Step 5/12 : COPY target/app.jar /app/app.jar",
+        " ---> Using cache",
+        "5f70bf18a086: Pushed",
+        "a3ed95caeb02: Layer already exists",
+    ]
+    lines = []
+    size = 0
+    while size < size_mb * 1024 * 1024:
+        line = rng.choice(filler)
+        lines.append(line)
+        size += len(line) + 1
+    repository = "sovell-registry.cn-shanghai.cr.aliyuncs.com/sovell/sovell-demeter"
+    lines.insert(len(lines) // 3, f"The push refers to repository [{repository}]")
+    lines.insert(len(lines) // 3 + 10, "v5.0.20.x86_64: digest: sha256:5d41402abc4b2a76b9719d911017c592 size: 2841")
+    lines.append(f"The push refers to repository [{repository}]")
+    lines.append("v5.0.20.aarch64: digest: sha256:7d793037a0760186574b0282f2f435e7 size: 2841")
+    return "\n".join(lines)
+
+
+def legacy_parse_log(log_text):
+    # 改造前的实现：逐行两次未编译的 search，再对整段文本跑四次 findall
+    repository = ""
+    digest_tags = []
+    for line in log_text.splitlines():
+        repo_match = re.search(r"The push refers to repository \[([^\]]+)\]", line)
+        if repo_match:
+            repository = repo_match.group(1).strip()
+        tag_match = re.search(r"\b([A-Za-z0-9_.-]+\.(?:x86_64|aarch64|arm64|arm)):\s+digest:\s+sha256:", line)
+        if tag_match:
+            digest_tags.append(tag_match.group(1).strip())
+    addresses = []
+    for pattern in (
+        r"[\w.-]+(?:-registry)?\.[\w.-]+\.aliyuncs\.com/[A-Za-z0-9._/@:-]+",
+        r"registry(?:\.[\w.-]+)+/[A-Za-z0-9._/@:-]+",
+        r"docker\.io/[A-Za-z0-9._/@:-]+",
+        r"harbor(?:\.[\w.-]+)+/[A-Za-z0-9._/@:-]+",
+    ):
+        addresses.extend(re.findall(pattern, log_text))
+    return repository, digest_tags, addresses
+
+
+def bench_acr_log():
+    log_text = synthetic_build_log()
+    log_bytes = log_text.encode("utf-8")
+    chunk_size = 64 * 1024
+
+    def optimized():
+        chunks = (log_bytes[start:start + chunk_size] for start in range(0, len(log_bytes), chunk_size))
+        parser = parse_acr_log(chunks)
+        return parser.images(), parser.registry_addresses()
+
+    baseline = best_of(lambda: legacy_parse_log(log_text), repeat=1)
+    optimized_time = best_of(optimized, repeat=3)
+    images, addresses = optimized()
+    report(f"acr_log ({len(log_bytes) / 1024 / 1024:.0f} MB, 64 KB byte chunks)", baseline, optimized_time)
+    print(f"  x86={images['x86']} arm={images['arm']} addresses={len(addresses)}")
+
+
+def synthetic_pipeline_payload(pipeline_count=400, seed=5):
+    # 与流水线列表/详情接口相同的结构：分页外壳、源配置、阶段和任务、参数
+    rng = random.Random(seed)
+    pipelines = []
+    for index in range(pipeline_count):
+        name = f"sovell-service-{index}"
+        stages = []
+        for stage_index in range(6):
+            jobs = []
+            for job_index in range(4):
+                jobs.append(
+                    {
+                        "id": rng.randint(10**7, 10**8),
+                        "name": rng.choice(["Java 构建", "镜像构建并推送至ACR x86", "单元测试", "部署"]),
+                        "status": rng.choice(["SUCCESS", "RUNNING", "QUEUED"]),
+                        "actions": [{"type": "log", "params": {"step": str(step), "cost": step * 1.5}} for step in range(3)],
+                    }
+                )
+            stages.append({"index": stage_index, "name": f"阶段{stage_index}", "jobs": jobs})
+        pipelines.append(
+            {
+                "pipelineId": 1390000 + index,
+                "name": name,
+                "updateTime": 1700000000000 + index,
+                "sources": [
+                    {
+                        "type": "codeup",
+                        "data": {"repo": f"{ORG_URL}/codeup/sovell/devops/{name}.git", "branch": "master", "isTrigger": True},
+                    }
+                ],
+                "stages": stages,
+                "globalParams": [{"key": f"K{param}", "value": f"v{param}", "encrypted": False} for param in range(8)],
+            }
+        )
+    return {"success": True, "data": {"total": pipeline_count, "records": pipelines}}
+
+
+def legacy_collect_strings(value):
+    if isinstance(value, str):
+        return [value]
+    result = []
+    if isinstance(value, dict):
+        for child in value.values():
+            result.extend(legacy_collect_strings(child))
+    elif isinstance(value, list):
+        for child in value:
+            result.extend(legacy_collect_strings(child))
+    return result
+
+
+def legacy_collect_pipeline_items(payload):
+    items = []
+    if isinstance(payload, dict):
+        if payload.get("pipelineId") or payload.get("pipeline_id") or payload.get("pipelineID") or payload.get("id"):
+            items.append(payload)
+        for key in ("data", "result", "items", "list", "pipelines", "records", "content"):
+            if key in payload:
+                items.extend(legacy_collect_pipeline_items(payload[key]))
+    elif isinstance(payload, list):
+        for value in payload:
+            items.extend(legacy_collect_pipeline_items(value))
+    return items
+
+
+def legacy_find_run_id(payload):
+    if isinstance(payload, int):
+        return str(payload)
+    if isinstance(payload, str) and payload.strip().isdigit():
+        return payload.strip()
+    if isinstance(payload, dict):
+        for key in ("runId", "run_id", "pipelineRunId", "buildId", "build_id", "id"):
+            if payload.get(key):
+                return str(payload.get(key))
+        for value in payload.values():
+            found = legacy_find_run_id(value)
+            if found:
+                return found
+    if isinstance(payload, list):
+        for value in payload:
+            found = legacy_find_run_id(value)
+            if found:
+                return found
+    return ""
+
+
+def bench_payload():
+    payload = synthetic_pipeline_payload()
+    # 触发接口的返回把运行 ID 放在一串只有文本的包装之后
+    run_payload = {"requestId": "9F3C-11AE", "messages": [["ok"] * 50] * 200, "object": {"result": {"pipelineRunId": 4242}}}
+
+    def legacy():
+        strings = legacy_collect_strings(payload)
+        items = legacy_collect_pipeline_items(payload)
+        refs = [text for item in items for text in legacy_collect_strings(item) if "/codeup/" in text]
+        return len(strings), len(items), len(refs), legacy_find_run_id(run_payload)
+
+    def optimized():
+        strings = sum(1 for _ in iter_strings(payload))
+        items = [node for node in walk(payload, pipeline_children) if isinstance(node, dict) and node.get("pipelineId")]
+        refs = [text for item in items for text in iter_strings(item) if "/codeup/" in text]
+        return strings, len(items), len(refs), find_run_id(run_payload)
+
+    assert legacy() == optimized()
+    report(f"payload ({optimized()[0]} strings, {optimized()[1]} pipelines)", best_of(legacy), best_of(optimized))
+
+    deep = run_payload
+    for _ in range(sys.getrecursionlimit() * 2):
+        deep = {"wrapper": [deep]}
+    try:
+        legacy_find_run_id(deep)
+        legacy_status = "ok"
+    except RecursionError:
+        legacy_status = "RecursionError"
+    print(f"  {sys.getrecursionlimit() * 4}-level payload: before {legacy_status}, after runId={find_run_id(deep)}")
+
+
+BENCHMARKS = {
+    "urls": bench_urls,
+    "acr_log": bench_acr_log,
+    "payload": bench_payload,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name}. Available: {', '.join(BENCHMARKS)}", file=sys.stderr)
+            return 1
+        BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,15 +1,20 @@
 #!/usr/bin/env python3
 import json
 import os
-import re
-import subprocess
 import sys
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests
 
-
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from ui.yunxiao.BranchPlan import build_branch_plan, load_branch_plan  # noqa: E402
+from ui.yunxiao.PayloadWalk import find_run_id  # noqa: E402
+from ui.yunxiao.YunxiaoApi import DEFAULT_TIMEOUT, api_headers, get_client  # noqa: E402
+
+
 CONFIG_PATH = os.path.join(os.path.expanduser("~"), "JRocket", "yunxiao_config.json")
 TOKEN_PATH = os.path.join(PROJECT_ROOT, "ui", "yunxiao", "yunxiaotoken.txt")
 DEFAULT_ORG_URL = "https://sovell-cn-shanghai.devops.aliyuncs.com"
@@ -23,34 +28,31 @@ DEFAULT_ROOTS = [
 def usage():
     print(
         """Usage:
-  scripts/push_branch_if_exists.sh <branch> [root_dir...]
+  scripts/push_branch_if_exists.sh [--concurrency N] [--plan] <branch> [root_dir...]
+  scripts/push_branch_if_exists.sh [--concurrency N] --from-plan <plan.json|->
 
 Examples:
   scripts/push_branch_if_exists.sh stable-v5.0.20-chongqingluqin
   scripts/push_branch_if_exists.sh stable-v5.0.20-chongqingluqin /Users/devjys/Desktop/WorkSpaces/sovell/sovell15~20
+  scripts/push_branch_if_exists.sh --concurrency 8 stable-v5.0.20-chongqingluqin
+  scripts/push_branch_if_exists.sh --plan stable-v5.0.20-chongqingluqin > plan.json
+  scripts/push_branch_if_exists.sh --from-plan plan.json
 
 Behavior:
   - Reads JRocket Yunxiao config from ~/JRocket/yunxiao_config.json.
   - Reads Yunxiao token from ui/yunxiao/yunxiaotoken.txt or YUNXIAO_TOKEN.
   - Scans local git repositories under configured roots or passed roots.
   - If a repository has the branch locally or under origin, triggers its matched Yunxiao pipeline.
+  - With --concurrency N (N > 1), checks up to N repositories at once, then keeps up to
+    N pipeline triggers in flight and prints each result as it completes. The same N
+    limits both steps. Totals and exit code are the same.
+  - With --plan, only prints the execution plan as JSON (repos with the branch, matched
+    pipelines and sources, unmatched repos) from cached repo and mapping data; nothing is triggered.
+  - With --from-plan, triggers exactly the runs listed in a plan printed by --plan.
 """
     )
 
 
-def run_git(repo_path, args, timeout=10):
-    process = subprocess.Popen(
-        ["git", "-C", repo_path] + args,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-    stdout, stderr = process.communicate(timeout=timeout)
-    if process.returncode != 0:
-        raise RuntimeError(stderr.strip() or stdout.strip())
-    return stdout.strip()
-
-
 def load_token():
     try:
         with open(TOKEN_PATH, "r", encoding="utf-8") as file:
@@ -69,147 +71,6 @@ def load_config():
         return json.load(file)
 
 
-def normalize_remote_url(remote_url):
-    remote_url = (remote_url or "").strip()
-    if remote_url.startswith("git@"):
-        match = re.match(r"git@([^:]+):(.+)", remote_url)
-        if match:
-            return f"https://{match.group(1)}/{match.group(2)}"
-    if remote_url.startswith("ssh://git@"):
-        parsed = urlparse(remote_url)
-        return f"https://{parsed.hostname}/{parsed.path.lstrip('/')}"
-    return remote_url
-
-
-def normalize_yunxiao_codeup_url(remote_url):
-    remote_url = normalize_remote_url(remote_url)
-    parsed = urlparse(remote_url)
-    if not parsed.scheme or not parsed.netloc:
-        return remote_url
-    path = parsed.path
-    if "devops.aliyuncs.com" in parsed.netloc and path.startswith("/codeup/sovell/"):
-        path = path.replace("/codeup/sovell/", "/codeup/", 1)
-        return parsed._replace(path=path).geturl()
-    return remote_url
-
-
-def normalize_for_match(value):
-    value = normalize_yunxiao_codeup_url(value or "").lower().rstrip("/")
-    if value.endswith(".git"):
-        value = value[:-4]
-    return value
-
-
-def repo_path_from_remote(remote_url):
-    normalized = normalize_yunxiao_codeup_url(remote_url)
-    parsed = urlparse(normalized)
-    path = parsed.path.lstrip("/") if parsed.path else normalized
-    path = path.lower().rstrip("/")
-    if path.endswith(".git"):
-        path = path[:-4]
-    return path
-
-
-def repo_name_from_text(value):
-    normalized = normalize_for_match(value)
-    return normalized.split("/")[-1] if normalized else ""
-
-
-def mapping_matches_repo(mapping, remote_url, repo_name, allow_repo_name=False):
-    key = (mapping.get("key") or "").strip()
-    if not key:
-        return False
-    repo_url_key = normalize_for_match(remote_url)
-    repo_path_key = repo_path_from_remote(remote_url)
-    repo_short_key = normalize_for_match(repo_name)
-    candidate = normalize_for_match(key)
-    candidate_path = repo_path_from_remote(candidate)
-    if repo_url_key and candidate == repo_url_key:
-        return True
-    if repo_path_key and (candidate == repo_path_key or candidate_path == repo_path_key):
-        return True
-    if allow_repo_name and repo_short_key and (candidate == repo_short_key or repo_name_from_text(candidate) == repo_short_key):
-        return True
-    return False
-
-
-def mapping_repo_url(mapping, fallback_url):
-    key = (mapping.get("key") or "").strip()
-    if key.startswith(("http://", "https://", "git@", "ssh://")) or "/codeup/" in key:
-        return normalize_yunxiao_codeup_url(key)
-    return normalize_yunxiao_codeup_url(fallback_url)
-
-
-def match_pipeline(remote_url, repo_name, manual_mappings, automatic_mappings):
-    for mapping in manual_mappings:
-        pipeline_id = (mapping.get("pipeline_id") or "").strip()
-        if pipeline_id and mapping_matches_repo(mapping, remote_url, repo_name, allow_repo_name=True):
-            return pipeline_id, "manual", mapping_repo_url(mapping, remote_url)
-
-    for mapping in automatic_mappings:
-        pipeline_id = (mapping.get("pipeline_id") or "").strip()
-        if pipeline_id and mapping_matches_repo(mapping, remote_url, repo_name):
-            return pipeline_id, "openapi", mapping_repo_url(mapping, remote_url)
-
-    exact_name_mappings = []
-    repo_short_key = normalize_for_match(repo_name)
-    for mapping in automatic_mappings:
-        pipeline_id = (mapping.get("pipeline_id") or "").strip()
-        mapping_repo_name = normalize_for_match(mapping.get("repo_name", ""))
-        mapping_key_name = repo_name_from_text(mapping.get("key", ""))
-        if pipeline_id and repo_short_key and repo_short_key in (mapping_repo_name, mapping_key_name):
-            exact_name_mappings.append(mapping)
-    if len(exact_name_mappings) == 1:
-        mapping = exact_name_mappings[0]
-        return (mapping.get("pipeline_id") or "").strip(), "openapi-name", mapping_repo_url(mapping, remote_url)
-
-    return "", "", normalize_yunxiao_codeup_url(remote_url)
-
-
-def branch_exists(repo_path, branch):
-    checks = [
-        ["show-ref", "--verify", "--quiet", f"refs/heads/{branch}"],
-        ["show-ref", "--verify", "--quiet", f"refs/remotes/origin/{branch}"],
-    ]
-    for args in checks:
-        process = subprocess.run(["git", "-C", repo_path] + args)
-        if process.returncode == 0:
-            return True
-    return False
-
-
-def collect_repositories(roots):
-    repos = []
-    seen = set()
-    for root in roots:
-        if not os.path.isdir(root):
-            print(f"[skip-root] not found: {root}")
-            continue
-        for current, dirs, _files in os.walk(root):
-            if ".git" not in dirs:
-                if current.count(os.sep) - root.count(os.sep) >= 2:
-                    dirs[:] = []
-                continue
-            dirs[:] = []
-            try:
-                remote_url = normalize_yunxiao_codeup_url(run_git(current, ["remote", "get-url", "origin"]))
-            except Exception as exc:
-                print(f"[skip] {current}: cannot read origin remote: {exc}")
-                continue
-            key = normalize_for_match(remote_url)
-            if key in seen:
-                continue
-            seen.add(key)
-            repos.append(
-                {
-                    "path": current,
-                    "repo_name": os.path.basename(current),
-                    "remote_url": remote_url,
-                }
-            )
-    return repos
-
-
 def trigger_pipeline(session, org_url, token, pipeline_id, repo_url, branch):
     params = {
         "runningBranchs": {repo_url: branch},
@@ -218,9 +79,9 @@ def trigger_pipeline(session, org_url, token, pipeline_id, repo_url, branch):
     url = f"{org_url}/oapi/v1/flow/pipelines/{pipeline_id}/runs"
     response = session.post(
         url,
-        headers={"Content-Type": "application/json", "x-yunxiao-token": token},
+        headers=api_headers(token),
         json={"params": json.dumps(params, ensure_ascii=False)},
-        timeout=20,
+        timeout=DEFAULT_TIMEOUT,
     )
     try:
         payload = response.json()
@@ -229,26 +90,99 @@ def trigger_pipeline(session, org_url, token, pipeline_id, repo_url, branch):
     return response.status_code, payload
 
 
-def find_run_id(payload):
-    if isinstance(payload, int):
-        return str(payload)
-    if isinstance(payload, str) and payload.strip().isdigit():
-        return payload.strip()
-    if isinstance(payload, dict):
-        for key in ("runId", "run_id", "pipelineRunId", "buildId", "build_id", "id"):
-            value = payload.get(key)
-            if value:
-                return str(value)
-        for value in payload.values():
-            found = find_run_id(value)
-            if found:
-                return found
-    if isinstance(payload, list):
-        for value in payload:
-            found = find_run_id(value)
-            if found:
-                return found
-    return ""
+def trigger_run(session, org_url, token, run, branch):
+    """返回 (HTTP 状态码, 返回内容)；请求没有拿到响应时返回 (None, 异常)。"""
+    try:
+        return trigger_pipeline(session, org_url, token, run["pipeline_id"], run["repo_url"], branch)
+    except requests.RequestException as exc:
+        return None, exc
+
+
+def report_result(org_url, run, status_code, payload, counts):
+    repo_name = run["repo_name"]
+    pipeline_id = run["pipeline_id"]
+    if status_code is None:
+        print(f"[fail] {repo_name}: {payload}")
+        counts["failed"] += 1
+        return
+    if not (200 <= status_code < 300):
+        print(f"[fail] {repo_name}: HTTP {status_code} {json.dumps(payload, ensure_ascii=False)[:1000]}")
+        counts["failed"] += 1
+        return
+    run_id = find_run_id(payload)
+    build_url = f"{org_url}/flow/pipelines/{pipeline_id}/builds/{run_id}" if run_id else ""
+    print(f"[ok] {repo_name}: runId={run_id or '-'} {build_url}")
+    counts["triggered"] += 1
+
+
+def print_run(run, branch):
+    print(f"[run] {run['repo_name']}: pipeline={run['pipeline_id']} source={run['source']} branch={branch}")
+    print(f"      runningBranchs={run['repo_url']}:{branch}")
+
+
+def trigger_sequentially(runs, branch, org_url, token):
+    session = get_client()
+    counts = {"triggered": 0, "failed": 0}
+    for run in runs:
+        print_run(run, branch)
+        status_code, payload = trigger_run(session, org_url, token, run, branch)
+        report_result(org_url, run, status_code, payload, counts)
+    return counts
+
+
+def trigger_concurrently(runs, branch, org_url, token, concurrency):
+    session = get_client()
+    counts = {"triggered": 0, "failed": 0}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {}
+        for run in runs:
+            print_run(run, branch)
+            futures[executor.submit(trigger_run, session, org_url, token, run, branch)] = run
+        # 按完成顺序输出结果，汇总与顺序执行相同
+        for future in as_completed(futures):
+            status_code, payload = future.result()
+            report_result(org_url, futures[future], status_code, payload, counts)
+    return counts
+
+
+def print_plan_skips(plan):
+    for root in plan["missing_roots"]:
+        print(f"[skip-root] not found: {root}")
+    for error in plan.get("origin_errors", []):
+        print(f"[skip] {error['path']}: cannot read origin remote: {error['error']}")
+    for error in plan["errors"]:
+        print(f"[skip] {error['path']}: {error['error']}")
+    for repo in plan["without_branch"]:
+        print(f"[skip] {repo['repo_name']}: branch not found: {plan['branch']}")
+    for repo in plan["unmatched"]:
+        print(f"[skip] {repo['repo_name']}: no matched Yunxiao pipeline")
+
+
+def parse_args(argv):
+    options = {"concurrency": 1, "plan": False, "from_plan": ""}
+    positional = []
+    index = 0
+    while index < len(argv):
+        arg = argv[index]
+        if arg in ("--concurrency", "--from-plan"):
+            if index + 1 >= len(argv):
+                raise ValueError(f"{arg} expects a value.")
+            options[arg[2:].replace("-", "_")] = argv[index + 1]
+            index += 2
+            continue
+        if arg.startswith(("--concurrency=", "--from-plan=")):
+            name, value = arg[2:].split("=", 1)
+            options[name.replace("-", "_")] = value
+        elif arg == "--plan":
+            options["plan"] = True
+        else:
+            positional.append(arg)
+        index += 1
+    try:
+        options["concurrency"] = max(1, int(options["concurrency"]))
+    except ValueError:
+        raise ValueError("--concurrency expects a number.") from None
+    return options, positional
 
 
 def main():
@@ -256,66 +190,66 @@ def main():
         usage()
         return 0
 
-    branch = sys.argv[1].strip()
-    if not branch:
-        print("Branch name cannot be empty.", file=sys.stderr)
+    try:
+        options, args = parse_args(sys.argv[1:])
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        usage()
         return 1
-
+    concurrency = options["concurrency"]
     config = load_config()
-    roots = sys.argv[2:] or config.get("roots") or DEFAULT_ROOTS
-    org_url = (config.get("org_url") or DEFAULT_ORG_URL).rstrip("/")
+
+    if options["from_plan"]:
+        try:
+            if options["from_plan"] == "-":
+                plan = load_branch_plan(sys.stdin)
+            else:
+                with open(options["from_plan"], "r", encoding="utf-8") as file:
+                    plan = load_branch_plan(file)
+        except (OSError, ValueError) as exc:
+            print(f"Cannot read plan: {exc}", file=sys.stderr)
+            return 1
+    else:
+        branch = args[0].strip() if args else ""
+        if not branch:
+            print("Branch name cannot be empty.", file=sys.stderr)
+            return 1
+        roots = args[1:] or config.get("roots") or DEFAULT_ROOTS
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            plan = build_branch_plan(
+                roots,
+                branch,
+                config.get("manual_mappings", config.get("mappings", [])),
+                config.get("automatic_mappings", []),
+                (config.get("org_url") or DEFAULT_ORG_URL).rstrip("/"),
+                config.get("trigger_rate"),
+                executor.map if concurrency > 1 else map,
+            )
+
+    if options["plan"]:
+        print(json.dumps(plan, ensure_ascii=False, indent=2))
+        return 0
+
     token = load_token()
     if not token:
         print(f"Missing Yunxiao token. Put it in {TOKEN_PATH} or export YUNXIAO_TOKEN.", file=sys.stderr)
         return 1
 
-    manual_mappings = config.get("manual_mappings", config.get("mappings", []))
-    automatic_mappings = config.get("automatic_mappings", [])
-
-    repos = collect_repositories(roots)
-    session = requests.Session()
-    session.trust_env = False
-
-    total = 0
-    triggered = 0
-    skipped = 0
-    failed = 0
-
-    for repo in repos:
-        total += 1
-        repo_name = repo["repo_name"]
-        if not branch_exists(repo["path"], branch):
-            print(f"[skip] {repo_name}: branch not found: {branch}")
-            skipped += 1
-            continue
-
-        pipeline_id, source, pipeline_repo_url = match_pipeline(
-            repo["remote_url"],
-            repo_name,
-            manual_mappings,
-            automatic_mappings,
-        )
-        if not pipeline_id:
-            print(f"[skip] {repo_name}: no matched Yunxiao pipeline")
-            skipped += 1
-            continue
-
-        print(f"[run] {repo_name}: pipeline={pipeline_id} source={source} branch={branch}")
-        print(f"      runningBranchs={pipeline_repo_url}:{branch}")
-        status_code, payload = trigger_pipeline(session, org_url, token, pipeline_id, pipeline_repo_url, branch)
-        if not (200 <= status_code < 300):
-            print(f"[fail] {repo_name}: HTTP {status_code} {json.dumps(payload, ensure_ascii=False)[:1000]}")
-            failed += 1
-            continue
-
-        run_id = find_run_id(payload)
-        build_url = f"{org_url}/flow/pipelines/{pipeline_id}/builds/{run_id}" if run_id else ""
-        print(f"[ok] {repo_name}: runId={run_id or '-'} {build_url}")
-        triggered += 1
+    branch = plan["branch"]
+    org_url = (plan.get("org_url") or config.get("org_url") or DEFAULT_ORG_URL).rstrip("/")
+    print_plan_skips(plan)
+    if concurrency > 1:
+        counts = trigger_concurrently(plan["runs"], branch, org_url, token, concurrency)
+    else:
+        counts = trigger_sequentially(plan["runs"], branch, org_url, token)
 
+    skipped = len(plan["without_branch"]) + len(plan["unmatched"])
     print()
-    print(f"Done. total={total} triggered={triggered} skipped={skipped} failed={failed}")
-    return 1 if failed else 0
+    print(
+        f"Done. total={plan['totals']['repositories']} triggered={counts['triggered']} "
+        f"skipped={skipped} failed={counts['failed']}"
+    )
+    return 1 if counts["failed"] else 0
 
 
 if __name__ == "__main__":
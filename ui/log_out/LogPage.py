@@ -1,30 +1,65 @@
-from PyQt5 import QtWidgets
+import collections
+import threading
+
+from PyQt5 import QtCore, QtWidgets
+
+
+LOG_MAX_BLOCKS = 5000  # 日志窗口最多保留的行数，超出后丢弃最早的
+LOG_RECENT_LINES = 2000  # 内存里保留的最近日志条数
+LOG_FLUSH_INTERVAL_MS = 100
+LOG_BATCH_SIZE = 500
+LOG_PENDING_LIMIT = LOG_MAX_BLOCKS  # 待显示的日志上限，再多窗口也留不住，超出时丢弃最早的
 
 
 class LogPage(QtWidgets.QWidget):
     log_widget = None  # 保存唯一实例
+    pending = collections.deque(maxlen=LOG_PENDING_LIMIT)  # 任意线程写入，界面线程定时取出
+    dropped = 0  # 积压超出上限被丢弃的条数，下次刷新时提示
+    recent = collections.deque(maxlen=LOG_RECENT_LINES)
+    lock = threading.Lock()
 
     def __init__(self):
         super().__init__()
         layout = QtWidgets.QVBoxLayout(self)
 
-        self.text_edit = QtWidgets.QTextEdit()
+        self.text_edit = QtWidgets.QPlainTextEdit()
+        self.text_edit.setObjectName("logTextEdit")
         self.text_edit.setReadOnly(True)
+        self.text_edit.setMaximumBlockCount(LOG_MAX_BLOCKS)
         layout.addWidget(self.text_edit)
 
-        # 保存实例用于静态方法调用
-        LogPage.log_widget = self
+        self.flush_timer = QtCore.QTimer(self)
+        self.flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start()
+
+        # 保存实例用于静态方法调用，窗口创建前的日志从最近记录里补上
+        with LogPage.lock:
+            if LogPage.recent:
+                self.text_edit.appendPlainText("\n".join(LogPage.recent))
+            LogPage.log_widget = self
 
     @staticmethod
     def log(msg: str):
+        """全局静态日志方法，任何线程都可以调用，只入队不碰界面"""
         # 同时打印到控制台并输出到日志窗口
         try:
             print(msg, flush=True)
         except Exception:
             pass
-        """全局静态日志方法"""
-        if LogPage.log_widget:
-            LogPage.log_widget.text_edit.append(msg)
-        else:
-            # 当日志窗口未初始化时，已在控制台打印
-            pass
+        with LogPage.lock:
+            LogPage.recent.append(msg)
+            if LogPage.log_widget:
+                if len(LogPage.pending) == LOG_PENDING_LIMIT:
+                    LogPage.dropped += 1
+                LogPage.pending.append(msg)
+
+    def flush(self):
+        # 每次最多取 LOG_BATCH_SIZE 条合并成一次追加，积压的留到下一轮
+        with LogPage.lock:
+            batch = [LogPage.pending.popleft() for _ in range(min(LOG_BATCH_SIZE, len(LogPage.pending)))]
+            dropped, LogPage.dropped = LogPage.dropped, 0
+        if dropped:
+            batch.insert(0, f"... 日志输出过快，丢弃了 {dropped} 行")
+        if batch:
+            self.text_edit.appendPlainText("\n".join(batch))
@@ -0,0 +1,156 @@
+import codecs
+import re
+
+
+PUSH_REPOSITORY_PATTERN = re.compile(r"The push refers to repository \[([^\]]+)\]")
+DIGEST_TAG_PATTERN = re.compile(r"\b([A-Za-z0-9_.-]+\.(?:x86_64|aarch64|arm64|arm)):\s+digest:\s+sha256:")
+REGISTRY_ADDRESS_PATTERNS = [
+    re.compile(r"[\w.-]+(?:-registry)?\.[\w.-]+\.aliyuncs\.com/[A-Za-z0-9._/@:-]+"),
+    re.compile(r"registry(?:\.[\w.-]+)+/[A-Za-z0-9._/@:-]+"),
+    re.compile(r"docker\.io/[A-Za-z0-9._/@:-]+"),
+    re.compile(r"harbor(?:\.[\w.-]+)+/[A-Za-z0-9._/@:-]+"),
+]
+# 每段日志只用这一个组合正则扫描一遍，命中的行或单词再交给上面的精确正则
+LOG_ANCHOR_PATTERN = re.compile(r"The push refers to repository \[|digest:|aliyuncs\.com/|registry|docker\.io/|harbor")
+LINE_ANCHORS = ("The push refers to repository [", "digest:")
+NON_SPACE_PATTERN = re.compile(r"\S*")
+
+
+def _tag_arch(tag):
+    if tag.endswith("x86_64"):
+        return "x86"
+    if tag.endswith(("aarch64", "arm64", "arm")):
+        return "arm"
+    return ""
+
+
+def _line_bounds(text, position):
+    start = max(text.rfind("\n", 0, position), text.rfind("\r", 0, position)) + 1
+    ends = [end for end in (text.find("\n", position), text.find("\r", position)) if end >= 0]
+    return start, min(ends) if ends else len(text)
+
+
+def _token_bounds(text, position):
+    start = position
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    return start, NON_SPACE_PATTERN.match(text, position).end()
+
+
+class AcrImageLogParser:
+    """
+    增量解析 ACR 镜像构建日志，保存目前为止找到的仓库地址、各架构最后一个 digest 标签和日志里出现的镜像仓库地址。
+    feed 接收任意切分的 str/bytes 片段，feed_lines 接收逐行的迭代器，feed_text 接收同一任务每次返回的完整日志。
+    """
+
+    def __init__(self):
+        self.offset = 0
+        self.pending = ""
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.repository = ""
+        self.tags = {"x86": "", "arm": ""}
+        self.addresses = [[] for _ in REGISTRY_ADDRESS_PATTERNS]
+
+    def reset(self):
+        self.__init__()
+
+    def feed_text(self, text):
+        text = text or ""
+        if len(text) < self.offset:
+            # 日志变短说明接口返回了新的内容，重新解析
+            self.reset()
+        chunk = text[self.offset:]
+        self.offset = len(text)
+        self.feed(chunk)
+
+    def feed(self, chunk):
+        if isinstance(chunk, (bytes, bytearray)):
+            chunk = self.decoder.decode(chunk)
+        if not chunk:
+            return
+        text = self.pending + chunk
+        # 最后一段没有换行符时先留着，等下一次新增内容补齐
+        cut = max(text.rfind("\n"), text.rfind("\r")) + 1
+        self.pending = text[cut:]
+        self._scan(text[:cut])
+
+    def feed_lines(self, lines):
+        for line in lines:
+            if isinstance(line, (bytes, bytearray)):
+                line = self.decoder.decode(line)
+            self.feed(line if line.endswith(("\n", "\r")) else f"{line}\n")
+        return self
+
+    def finish(self):
+        tail = self.pending + self.decoder.decode(b"", final=True)
+        self.pending = ""
+        self._scan(tail)
+        return self
+
+    def _scan(self, text):
+        last_line = -1
+        last_token = -1
+        for match in LOG_ANCHOR_PATTERN.finditer(text):
+            position = match.start()
+            if match.group() in LINE_ANCHORS:
+                start, end = _line_bounds(text, position)
+                if start != last_line:
+                    last_line = start
+                    self._scan_line(text[start:end])
+            else:
+                start, end = _token_bounds(text, position)
+                if start != last_token:
+                    last_token = start
+                    self._scan_token(text[start:end])
+
+    def _scan_line(self, line):
+        repo_match = PUSH_REPOSITORY_PATTERN.search(line)
+        if repo_match:
+            self.repository = repo_match.group(1).strip()
+        tag_match = DIGEST_TAG_PATTERN.search(line)
+        if tag_match:
+            tag = tag_match.group(1).strip()
+            arch = _tag_arch(tag)
+            if arch:
+                self.tags[arch] = tag
+
+    def _scan_token(self, token):
+        for pattern, found in zip(REGISTRY_ADDRESS_PATTERNS, self.addresses):
+            found.extend(pattern.findall(token))
+
+    def _with_pending(self):
+        # 末尾还没换行的半行也参与结果，但不计入已解析状态
+        if not self.pending:
+            return self
+        snapshot = AcrImageLogParser()
+        snapshot.repository = self.repository
+        snapshot.tags = dict(self.tags)
+        snapshot.addresses = [list(found) for found in self.addresses]
+        snapshot._scan(self.pending)
+        return snapshot
+
+    def images(self):
+        parsed = self._with_pending()
+        result = {"x86": "", "arm": ""}
+        if not parsed.repository:
+            return result
+        for arch, tag in parsed.tags.items():
+            if tag:
+                result[arch] = f"{parsed.repository}:{tag}"
+        return result
+
+    def registry_addresses(self):
+        parsed = self._with_pending()
+        cleaned = (image.rstrip(".,;)'\"]") for found in parsed.addresses for image in found)
+        return list(dict.fromkeys(cleaned))
+
+
+def parse_acr_log(chunks):
+    parser = AcrImageLogParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.finish()
+
+
+def extract_final_acr_images(log_text):
+    return parse_acr_log([log_text or ""]).images()
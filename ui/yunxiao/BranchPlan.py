@@ -0,0 +1,120 @@
+import json
+import os
+import time
+from datetime import datetime
+
+from ui.yunxiao.MappingIndex import MappingIndex
+from ui.yunxiao.RepoIndex import get_repo_index
+from ui.yunxiao.YunxiaoGit import normalize_branch_name, repo_has_branch
+from ui.yunxiao.YunxiaoUrls import normalize_yunxiao_codeup_url
+
+
+PLAN_PATH = os.path.join(os.path.expanduser("~"), "JRocket", "yunxiao_branch_plan.json")
+PLAN_VERSION = 1
+
+
+def mapping_repo_url(mapping, fallback_url):
+    key = (mapping.get("key") or "").strip()
+    if key.startswith(("http://", "https://", "git@", "ssh://")) or "/codeup/" in key:
+        return normalize_yunxiao_codeup_url(key)
+    return normalize_yunxiao_codeup_url(fallback_url)
+
+
+def _check_branch(path, branch):
+    try:
+        return repo_has_branch(path, branch), ""
+    except Exception as exc:
+        return False, str(exc)
+
+
+def build_branch_plan(roots, branch, manual_mappings, automatic_mappings, org_url="", trigger_rate=None, check_map=map):
+    """
+    只用仓库索引、本地引用和已保存的映射生成分支执行计划，不请求云效接口。
+    同一远程地址的多个克隆只保留第一个存在该分支的；check_map 可以换成线程池的 map 并行检查分支。
+    """
+    started = time.perf_counter()
+    branch = normalize_branch_name(branch)
+    mapping_index = MappingIndex(manual_mappings, automatic_mappings)
+    entries, missing_roots, failures = get_repo_index().refresh(roots)
+    checks = check_map(lambda entry: _check_branch(entry["path"], branch), entries)
+    # 读不到 origin 的仓库先看有没有该分支，只报告有分支的；两种都不计入仓库总数
+    failure_checks = check_map(lambda failure: _check_branch(failure[0], branch), failures)
+
+    runs = []
+    unmatched = []
+    without_branch = {}
+    errors = []
+    origin_errors = [
+        {"path": path, "error": error} for (path, error), (has_branch, _) in zip(failures, failure_checks) if has_branch
+    ]
+    seen = set()
+    for entry, (has_branch, error) in zip(entries, checks):
+        key = entry["match_key"]
+        if error:
+            errors.append({"path": entry["path"], "error": error})
+        if not has_branch:
+            without_branch.setdefault(key, {"repo_name": entry["repo_name"], "path": entry["path"]})
+            continue
+        if key in seen:
+            continue
+        seen.add(key)
+        repo = {
+            "repo_name": entry["repo_name"],
+            "workspace": entry["workspace"],
+            "path": entry["path"],
+            "remote_url": entry["remote_url"],
+        }
+        mapping, source = mapping_index.match(entry["remote_url"], entry["repo_name"])
+        if not mapping:
+            unmatched.append(repo)
+            continue
+        repo.update(
+            {
+                "pipeline_id": (mapping.get("pipeline_id") or "").strip(),
+                "pipeline_name": (mapping.get("pipeline_name") or "").strip(),
+                "source": source,
+                "repo_url": mapping_repo_url(mapping, entry["remote_url"]),
+            }
+        )
+        runs.append(repo)
+
+    without_branch = [repo for key, repo in without_branch.items() if key not in seen]
+    estimate = {"triggers": len(runs)}
+    if trigger_rate:
+        estimate["trigger_rate"] = trigger_rate
+        estimate["min_seconds"] = round(len(runs) / trigger_rate, 1)
+    return {
+        "version": PLAN_VERSION,
+        "branch": branch,
+        "org_url": org_url,
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "runs": runs,
+        "unmatched": unmatched,
+        "without_branch": without_branch,
+        "missing_roots": missing_roots,
+        "errors": errors,
+        "origin_errors": origin_errors,
+        "totals": {
+            "repositories": len(runs) + len(unmatched) + len(without_branch),
+            "runs": len(runs),
+            "unmatched": len(unmatched),
+            "without_branch": len(without_branch),
+        },
+        "estimate": estimate,
+        "planning_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def save_branch_plan(plan, path=PLAN_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(plan, file, ensure_ascii=False, indent=4)
+    os.replace(temp_path, path)
+
+
+def load_branch_plan(file):
+    plan = json.load(file)
+    if plan.get("version") != PLAN_VERSION:
+        raise ValueError(f"unsupported plan version: {plan.get('version')}")
+    return plan
@@ -0,0 +1,280 @@
+import json
+import os
+import sqlite3
+import threading
+
+
+HISTORY_DB_PATH = os.path.join(os.path.expanduser("~"), "JRocket", "yunxiao_history.db")
+HISTORY_LOG_PATH = os.path.join(os.path.expanduser("~"), "JRocket", "yunxiao_history.jsonl")
+LEGACY_HISTORY_PATH = os.path.join(os.path.expanduser("~"), "JRocket", "yunxiao_history.json")
+# (字段名, 历史表格列标题)，旧版 yunxiao_history.json 以列标题为键
+HISTORY_COLUMNS = [
+    ("executed_at", "执行时间"),
+    ("repo_name", "仓库"),
+    ("branch", "分支"),
+    ("commit_summary", "提交"),
+    ("pipeline_id", "流水线"),
+    ("pipeline_source", "来源"),
+    ("status", "状态"),
+    ("build_url", "构建地址"),
+    ("x86_image", "x86镜像"),
+    ("arm_image", "arm镜像"),
+    ("message", "返回信息"),
+]
+HISTORY_FIELDS = [field for field, _ in HISTORY_COLUMNS]
+HISTORY_PAGE_SIZE = 1000
+FLUSH_INTERVAL_SECONDS = 3
+# 数据库文件打不开时退回到只在本次运行有效的内存库
+MEMORY_DB_PATH = ":memory:"
+# PRAGMA user_version 记录旧历史的导入状态；更早创建的数据库为 0，视为已导入
+OLD_HISTORY_PENDING = 1
+OLD_HISTORY_IMPORTED = 2
+# 可按等值筛选的字段，均有索引
+FILTER_FIELDS = ("repo_name", "branch", "pipeline_id", "status")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    {columns}
+);
+CREATE INDEX IF NOT EXISTS idx_history_executed_at ON history (executed_at);
+CREATE INDEX IF NOT EXISTS idx_history_repo ON history (repo_name, executed_at);
+CREATE INDEX IF NOT EXISTS idx_history_branch ON history (branch, executed_at);
+CREATE INDEX IF NOT EXISTS idx_history_pipeline ON history (pipeline_id, executed_at);
+CREATE INDEX IF NOT EXISTS idx_history_status ON history (status, executed_at);
+""".format(columns=",\n    ".join(f"{field} TEXT NOT NULL DEFAULT ''" for field in HISTORY_FIELDS))
+
+
+def _time_bound(value, end):
+    # 只写到日期或分钟时补齐，让结束时间包含当天/当分钟
+    value = (value or "").strip()
+    if end and len(value) == 10:
+        return f"{value} 23:59:59"
+    if end and len(value) == 16:
+        return f"{value}:59"
+    return value
+
+
+def _read_history_log(path):
+    # 迁移 JSON Lines 执行日志：按顺序回放新增和更新记录
+    records = {}
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("op") == "add":
+                records[entry["id"]] = dict(entry["record"])
+            elif entry.get("op") == "update" and entry.get("id") in records:
+                records[entry["id"]].update(entry["fields"])
+    for record in records.values():
+        record.setdefault("commit_summary", record.pop("commit", ""))
+    return list(records.values())
+
+
+def _read_legacy_history(path):
+    with open(path, "r", encoding="utf-8") as file:
+        rows = json.load(file)
+    return [{field: str(row.get(header, "")) for field, header in HISTORY_COLUMNS} for row in rows]
+
+
+class HistoryStoreClosed(RuntimeError):
+    pass
+
+
+class HistoryStore:
+    """
+    SQLite 执行历史，按仓库、分支、流水线、状态和执行时间建索引，界面只查询当前页。
+    add/update 只改内存里的待写记录，后台线程每 FLUSH_INTERVAL_SECONDS 秒把它们合并成一个事务写入，
+    同一条记录多次更新只写最后的值；查询前和 close 时会先写完，close 之后再 add/update 抛出 HistoryStoreClosed。
+    on_flush_error 在后台线程里调用，调用方需要自己切回界面线程。
+    首次创建数据库时导入 JSON Lines 日志或更早的 yunxiao_history.json，导入失败时通过 on_import_error 报告，
+    旧文件保持不动，下次打开时重试；path 为 MEMORY_DB_PATH 时不读写磁盘。
+    """
+
+    def __init__(
+        self,
+        path=HISTORY_DB_PATH,
+        log_path=HISTORY_LOG_PATH,
+        legacy_path=LEGACY_HISTORY_PATH,
+        flush_interval=FLUSH_INTERVAL_SECONDS,
+        on_flush_error=None,
+        on_import_error=None,
+    ):
+        self.path = path
+        self.on_flush_error = on_flush_error
+        # lock 保护待写记录，db_lock 串行化数据库访问，写盘时界面线程仍能继续 add/update
+        self.lock = threading.Lock()
+        self.db_lock = threading.Lock()
+        self.pending_adds = {}
+        self.pending_updates = {}
+        in_memory = path == MEMORY_DB_PATH
+        if not in_memory:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        created = not in_memory and not os.path.exists(path)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        if created:
+            self.connection.execute(f"PRAGMA user_version = {OLD_HISTORY_PENDING}")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] == OLD_HISTORY_PENDING:
+            self._import_old_history(log_path, legacy_path, on_import_error)
+        self.next_id = (self.connection.execute("SELECT MAX(id) FROM history").fetchone()[0] or 0) + 1
+        self.closed = threading.Event()
+        self.flush_thread = threading.Thread(target=self._flush_loop, args=(flush_interval,), daemon=True)
+        self.flush_thread.start()
+
+    def _import_old_history(self, log_path, legacy_path, on_import_error):
+        records = []
+        try:
+            if os.path.exists(log_path):
+                records = _read_history_log(log_path)
+            elif os.path.exists(legacy_path):
+                records = _read_legacy_history(legacy_path)
+            with self.connection:
+                # 上次导入失败后可能已经有新记录，旧记录接在后面编号
+                start = (self.connection.execute("SELECT MAX(id) FROM history").fetchone()[0] or 0) + 1
+                self._insert(enumerate(records, start))
+                self.connection.execute(f"PRAGMA user_version = {OLD_HISTORY_IMPORTED}")
+        except (OSError, ValueError, sqlite3.Error) as exc:
+            if on_import_error:
+                on_import_error(exc)
+
+    def _insert(self, items):
+        columns = ", ".join(("id",) + tuple(HISTORY_FIELDS))
+        placeholders = ", ".join("?" for _ in range(len(HISTORY_FIELDS) + 1))
+        self.connection.executemany(
+            f"INSERT INTO history ({columns}) VALUES ({placeholders})",
+            ([record_id] + [str(record.get(field, "")) for field in HISTORY_FIELDS] for record_id, record in items),
+        )
+
+    def add(self, record):
+        """记录 ID 在内存里分配，立即返回，不等写盘。"""
+        with self.lock:
+            self._check_open()
+            record_id = self.next_id
+            self.next_id += 1
+            self.pending_adds[record_id] = {field: str(record.get(field, "")) for field in HISTORY_FIELDS}
+        return record_id
+
+    def update(self, record_id, fields):
+        fields = {field: str(value) for field, value in fields.items() if field in HISTORY_FIELDS}
+        if not fields:
+            return
+        with self.lock:
+            self._check_open()
+            if record_id in self.pending_adds:
+                self.pending_adds[record_id].update(fields)
+            else:
+                self.pending_updates.setdefault(record_id, {}).update(fields)
+
+    def _check_open(self):
+        # 在 lock 内检查，close 取走最后一批待写记录后不会再有新记录进来
+        if self.closed.is_set():
+            raise HistoryStoreClosed("执行历史已关闭")
+
+    def dirty(self):
+        with self.lock:
+            return bool(self.pending_adds or self.pending_updates)
+
+    def flush(self):
+        """把待写记录合并成一个事务写入；失败时放回待写队列，下次再试。"""
+        # 没有待写记录时不去抢 db_lock，空闲的后台轮询和每次查询前的 flush 都不会等正在进行的查询
+        if not self.dirty():
+            return
+        with self.db_lock:
+            with self.lock:
+                adds, self.pending_adds = self.pending_adds, {}
+                updates, self.pending_updates = self.pending_updates, {}
+            if not adds and not updates:
+                return
+            try:
+                with self.connection:
+                    self._insert(adds.items())
+                    for record_id, fields in updates.items():
+                        assignments = ", ".join(f"{field} = ?" for field in fields)
+                        self.connection.execute(
+                            f"UPDATE history SET {assignments} WHERE id = ?",
+                            list(fields.values()) + [record_id],
+                        )
+            except sqlite3.Error:
+                self._requeue(adds, updates)
+                raise
+
+    def _requeue(self, adds, updates):
+        # 写失败期间新来的更新比旧的新，合并时以新的为准
+        with self.lock:
+            for record_id, fields in self.pending_updates.items():
+                if record_id in adds:
+                    adds[record_id].update(fields)
+                else:
+                    updates.setdefault(record_id, {}).update(fields)
+            adds.update(self.pending_adds)
+            self.pending_adds = adds
+            self.pending_updates = updates
+
+    def _flush_loop(self, interval):
+        while not self.closed.wait(interval):
+            try:
+                self.flush()
+            except sqlite3.Error as exc:
+                if self.on_flush_error:
+                    self.on_flush_error(exc)
+
+    def clear(self):
+        with self.db_lock:
+            with self.lock:
+                self.pending_adds = {}
+                self.pending_updates = {}
+            with self.connection:
+                self.connection.execute("DELETE FROM history")
+
+    def _where(self, filters):
+        clauses = []
+        params = []
+        for field in FILTER_FIELDS:
+            value = (filters.get(field) or "").strip()
+            if value:
+                clauses.append(f"{field} = ?")
+                params.append(value)
+        since = _time_bound(filters.get("since"), end=False)
+        if since:
+            clauses.append("executed_at >= ?")
+            params.append(since)
+        until = _time_bound(filters.get("until"), end=True)
+        if until:
+            clauses.append("executed_at <= ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, filters=None, limit=HISTORY_PAGE_SIZE, offset=0):
+        """按筛选条件返回一页 [(记录 ID, 记录)]，最新的在前。"""
+        self.flush()
+        where, params = self._where(filters or {})
+        with self.db_lock:
+            rows = self.connection.execute(
+                f"SELECT id, {', '.join(HISTORY_FIELDS)} FROM history{where} "
+                "ORDER BY executed_at DESC, id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return [(row[0], dict(zip(HISTORY_FIELDS, row[1:]))) for row in rows]
+
+    def count(self, filters=None):
+        self.flush()
+        where, params = self._where(filters or {})
+        with self.db_lock:
+            return self.connection.execute(f"SELECT COUNT(*) FROM history{where}", params).fetchone()[0]
+
+    def close(self):
+        """停止后台写入并写完剩余记录，可以重复调用。"""
+        if self.closed.is_set():
+            return
+        self.closed.set()
+        self.flush_thread.join()
+        try:
+            self.flush()
+        finally:
+            with self.db_lock:
+                self.connection.close()
@@ -0,0 +1,82 @@
+from ui.yunxiao.YunxiaoUrls import normalize_for_match, repo_name_from_text, repo_path_from_remote
+
+
+def _add_first(table, key, position):
+    if key and key not in table:
+        table[key] = position
+
+
+class _MappingTable:
+    """单组映射的查找表，值为映射在原列表中的位置，保证与逐条匹配时的先后顺序一致。"""
+
+    def __init__(self, mappings, allow_repo_name):
+        self.mappings = []
+        self.by_url = {}
+        self.by_path = {}
+        self.by_name = {}
+        for mapping in mappings:
+            pipeline_id = (mapping.get("pipeline_id") or "").strip()
+            key = (mapping.get("key") or "").strip()
+            if not pipeline_id or not key:
+                continue
+            position = len(self.mappings)
+            self.mappings.append(mapping)
+            candidate = normalize_for_match(key)
+            _add_first(self.by_url, candidate, position)
+            _add_first(self.by_path, candidate, position)
+            _add_first(self.by_path, repo_path_from_remote(candidate), position)
+            if allow_repo_name:
+                _add_first(self.by_name, candidate, position)
+                _add_first(self.by_name, repo_name_from_text(candidate), position)
+
+    def find(self, repo_url_key, repo_path_key, repo_short_key):
+        positions = []
+        if repo_url_key and repo_url_key in self.by_url:
+            positions.append(self.by_url[repo_url_key])
+        if repo_path_key and repo_path_key in self.by_path:
+            positions.append(self.by_path[repo_path_key])
+        if repo_short_key and repo_short_key in self.by_name:
+            positions.append(self.by_name[repo_short_key])
+        if not positions:
+            return None
+        return self.mappings[min(positions)]
+
+
+class MappingIndex:
+    """
+    手动映射和 OpenAPI 自动映射的预编译索引，查找规则与逐条调用 mapping_matches_repo 相同：
+    手动映射优先（允许按仓库名匹配），其次按远程地址/仓库路径匹配自动映射，
+    最后仓库名在自动映射中恰好只对应一条时才使用。
+    """
+
+    def __init__(self, manual_mappings, automatic_mappings):
+        self.manual = _MappingTable(manual_mappings, allow_repo_name=True)
+        self.automatic = _MappingTable(automatic_mappings, allow_repo_name=False)
+        self.automatic_by_name = {}
+        for mapping in automatic_mappings:
+            if not (mapping.get("pipeline_id") or "").strip():
+                continue
+            names = {
+                normalize_for_match(mapping.get("repo_name", "")),
+                repo_name_from_text(mapping.get("key", "")),
+            }
+            for name in names:
+                if name:
+                    self.automatic_by_name.setdefault(name, []).append(mapping)
+
+    def match(self, remote_url, repo_name):
+        """返回 (映射, 来源)，来源为 manual / openapi / openapi-name；未匹配返回 (None, "")。"""
+        repo_url_key = normalize_for_match(remote_url)
+        repo_path_key = repo_path_from_remote(remote_url)
+        repo_short_key = normalize_for_match(repo_name)
+        mapping = self.manual.find(repo_url_key, repo_path_key, repo_short_key)
+        if mapping:
+            return mapping, "manual"
+        mapping = self.automatic.find(repo_url_key, repo_path_key, "")
+        if mapping:
+            return mapping, "openapi"
+        if repo_short_key:
+            name_mappings = self.automatic_by_name.get(repo_short_key, [])
+            if len(name_mappings) == 1:
+                return name_mappings[0], "openapi-name"
+        return None, ""
@@ -0,0 +1,149 @@
+RUN_ID_KEYS = ("runId", "run_id", "pipelineRunId", "buildId", "build_id", "id")
+PIPELINE_CONTAINER_KEYS = ("data", "result", "items", "list", "pipelines", "records", "content")
+PIPELINE_CONTAINER_KEY_SET = frozenset(PIPELINE_CONTAINER_KEYS)
+
+
+def json_children(node):
+    if isinstance(node, dict):
+        return node.values()
+    if isinstance(node, list):
+        return node
+    return None
+
+
+def pipeline_children(node):
+    # 流水线列表只沿常见的容器字段往下找，不进入流水线详情内部；
+    # 流水线节点大多没有容器字段，先用集合判断，不为每个节点建列表
+    if isinstance(node, dict):
+        if node.keys().isdisjoint(PIPELINE_CONTAINER_KEY_SET):
+            return None
+        return [node[key] for key in PIPELINE_CONTAINER_KEYS if key in node]
+    if isinstance(node, list):
+        return node
+    return None
+
+
+# 下面的遍历都用“迭代器栈”：栈里放每层还没走完的子节点迭代器，遇到容器才压栈，
+# 不为每个节点复制或反转子节点列表，顺序与递归遍历相同，嵌套再深也不会超过递归上限。
+
+
+def walk(payload, children=json_children):
+    """先序遍历 JSON，依次产出每个节点。"""
+    if children is json_children:
+        return _walk_json(payload)
+    return _walk_children(payload, children)
+
+
+def _walk_children(payload, children):
+    yield payload
+    nested = children(payload)
+    if not nested:
+        return
+    stack = [iter(nested)]
+    while stack:
+        for node in stack[-1]:
+            yield node
+            nested = children(node)
+            if nested:
+                stack.append(iter(nested))
+                break
+        else:
+            stack.pop()
+
+
+def _walk_json(payload):
+    # walk 的默认情形，子节点判断内联，省去每个节点一次 children 调用
+    yield payload
+    if isinstance(payload, dict):
+        stack = [iter(payload.values())]
+    elif isinstance(payload, list):
+        stack = [iter(payload)]
+    else:
+        return
+    while stack:
+        for node in stack[-1]:
+            yield node
+            if isinstance(node, dict):
+                stack.append(iter(node.values()))
+                break
+            if isinstance(node, list):
+                stack.append(iter(node))
+                break
+        else:
+            stack.pop()
+
+
+def walk_with_path(payload):
+    """与 walk 相同，额外产出节点的键路径；路径列表在遍历中原地复用，需要保留时自行复制。"""
+    path = []
+    yield payload, path
+    if isinstance(payload, dict):
+        stack = [iter(payload.items())]
+    elif isinstance(payload, list):
+        stack = [enumerate(payload)]
+    else:
+        return
+    while stack:
+        for key, node in stack[-1]:
+            path.append(key)
+            yield node, path
+            if isinstance(node, dict):
+                stack.append(iter(node.items()))
+                break
+            if isinstance(node, list):
+                stack.append(enumerate(node))
+                break
+            path.pop()
+        else:
+            stack.pop()
+            if path:
+                path.pop()
+
+
+def iter_strings(payload):
+    stack = [iter((payload,))]
+    while stack:
+        for node in stack[-1]:
+            if isinstance(node, str):
+                yield node
+            elif isinstance(node, dict):
+                stack.append(iter(node.values()))
+                break
+            elif isinstance(node, list):
+                stack.append(iter(node))
+                break
+        else:
+            stack.pop()
+
+
+def first_match(payload, extract, children=json_children, default=""):
+    """按先序返回第一个 extract 结果为真的值，找到后立即停止遍历。"""
+    for node in walk(payload, children):
+        found = extract(node)
+        if found:
+            return found
+    return default
+
+
+def run_id_from_node(node):
+    # 字符串最常见，先判断；bool 是 int 的子类，要排在 int 前面
+    if isinstance(node, str):
+        node = node.strip()
+        return node if node.isdigit() else ""
+    if isinstance(node, dict):
+        for key in RUN_ID_KEYS:
+            value = node.get(key)
+            if value:
+                return str(value)
+        return ""
+    if isinstance(node, bool):
+        return ""
+    if isinstance(node, int):
+        return str(node)
+    if isinstance(node, float) and node.is_integer():
+        return str(int(node))
+    return ""
+
+
+def find_run_id(payload):
+    return first_match(payload, run_id_from_node)
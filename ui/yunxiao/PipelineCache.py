@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+import threading
+
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), "JRocket", "yunxiao_pipeline_cache.json")
+CACHE_VERSION = 1
+# 流水线列表项里可能出现的更新时间字段
+UPDATED_KEYS = ("updateTime", "gmtModified", "modifiedTime", "updatedAt", "gmtUpdate")
+
+
+def pipeline_updated_marker(item):
+    if not isinstance(item, dict):
+        return ""
+    for key in UPDATED_KEYS:
+        if item.get(key):
+            return str(item.get(key))
+    return ""
+
+
+def payload_fingerprint(content):
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha1(content).hexdigest()
+
+
+class PipelineCache:
+    """
+    流水线详情缓存，按流水线 ID 保存每个详情接口的 ETag/Last-Modified、
+    返回内容指纹和解析出的映射，刷新时只重新获取新增或变更的流水线。
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.pipelines = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except Exception:
+            return
+        if data.get("version") == CACHE_VERSION:
+            self.pipelines = data.get("pipelines", {})
+
+    def save(self):
+        with self.lock:
+            data = {"version": CACHE_VERSION, "pipelines": self.pipelines}
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(data, file, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+
+    def get(self, pipeline_id):
+        with self.lock:
+            return self.pipelines.get(pipeline_id)
+
+    def put(self, pipeline_id, entry):
+        with self.lock:
+            self.pipelines[pipeline_id] = entry
+
+    def retain(self, pipeline_ids):
+        keep = set(pipeline_ids)
+        with self.lock:
+            for pipeline_id in [pipeline_id for pipeline_id in self.pipelines if pipeline_id not in keep]:
+                del self.pipelines[pipeline_id]
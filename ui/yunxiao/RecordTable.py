@@ -0,0 +1,154 @@
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+URL_COLOR = "#0969da"
+
+
+class TableRecord:
+    """表格行记录，子类用 __slots__ 列出字段，未给出的字段为空字符串。"""
+
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for field in self.__slots__:
+            setattr(self, field, values.get(field, ""))
+
+    def update(self, values):
+        for field, value in values.items():
+            setattr(self, field, value)
+
+
+class RecordTableModel(QtCore.QAbstractTableModel):
+    """
+    只读表格模型：视图只向模型要可见单元格的数据，不再为每个值创建 QTableWidgetItem。
+    columns 为 [(字段名, 列标题)]；url_field 列显示成链接，双击打开；key_field 用来按记录 ID 找行。
+    """
+
+    def __init__(self, columns, url_field="", key_field="", parent=None):
+        super().__init__(parent)
+        self.fields = [field for field, _ in columns]
+        self.headers = [header for _, header in columns]
+        self.url_field = url_field
+        self.key_field = key_field
+        self.records = []
+        self.key_rows = {}
+        self.url_brush = QtGui.QBrush(QtGui.QColor(URL_COLOR))
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.fields)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.records[index.row()]
+        field = self.fields[index.column()]
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return str(getattr(record, field))
+        if field == self.url_field and getattr(record, field):
+            if role == QtCore.Qt.ForegroundRole:
+                return self.url_brush
+            if role == QtCore.Qt.FontRole:
+                font = QtGui.QFont()
+                font.setUnderline(True)
+                return font
+            if role == QtCore.Qt.ToolTipRole:
+                return "双击打开构建地址"
+        if role == QtCore.Qt.ForegroundRole:
+            return self.foreground(record, field)
+        return None
+
+    def foreground(self, record, field):
+        return None
+
+    def record(self, row):
+        return self.records[row]
+
+    def row_of(self, key):
+        return self.key_rows.get(key)
+
+    def _reindex(self):
+        if self.key_field:
+            self.key_rows = {getattr(record, self.key_field): row for row, record in enumerate(self.records)}
+
+    def set_records(self, records):
+        self.beginResetModel()
+        self.records = list(records)
+        self._reindex()
+        self.endResetModel()
+
+    def insert_record(self, row, record):
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.records.insert(row, record)
+        self._reindex()
+        self.endInsertRows()
+
+    def remove_rows_from(self, row):
+        """删除 row 及其后的所有行。"""
+        if row >= len(self.records):
+            return
+        self.beginRemoveRows(QtCore.QModelIndex(), row, len(self.records) - 1)
+        del self.records[row:]
+        self._reindex()
+        self.endRemoveRows()
+
+    def update_record(self, row, values):
+        """更新一行的部分字段，只通知变化的这几列重绘；行已被清空或重建时忽略。"""
+        if row >= len(self.records):
+            return
+        record = self.records[row]
+        record.update(values)
+        columns = [self.fields.index(field) for field in values if field in self.fields]
+        if columns:
+            self.dataChanged.emit(self.index(row, min(columns)), self.index(row, max(columns)))
+
+
+class CopyableTableView(QtWidgets.QTableView):
+    """Ctrl+C 按制表符复制选中的单元格，双击 url_field 列打开链接。"""
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setWordWrap(False)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 8)
+        self.doubleClicked.connect(self.open_url)
+
+    def keyPressEvent(self, event):
+        if event.matches(QtGui.QKeySequence.Copy):
+            self.copy_selection()
+            return
+        super().keyPressEvent(event)
+
+    def copy_selection(self):
+        model = self.model()
+        ranges = self.selectionModel().selection()
+        if ranges.isEmpty():
+            current = self.currentIndex()
+            if current.isValid():
+                QtWidgets.QApplication.clipboard().setText(model.data(current))
+            return
+
+        lines = []
+        for selected_range in ranges:
+            for row in range(selected_range.top(), selected_range.bottom() + 1):
+                values = [
+                    model.data(model.index(row, col))
+                    for col in range(selected_range.left(), selected_range.right() + 1)
+                ]
+                lines.append("\t".join(values))
+        QtWidgets.QApplication.clipboard().setText("\n".join(lines))
+
+    def open_url(self, index):
+        model = self.model()
+        if not index.isValid() or model.fields[index.column()] != model.url_field:
+            return
+        url = model.data(index).strip()
+        if url.startswith(("http://", "https://")):
+            QtGui.QDesktopServices.openUrl(QtCore.QUrl(url))
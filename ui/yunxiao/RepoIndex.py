@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+
+from ui.yunxiao.YunxiaoGit import run_git
+from ui.yunxiao.YunxiaoUrls import normalize_for_match, normalize_yunxiao_codeup_url
+
+
+INDEX_PATH = os.path.join(os.path.expanduser("~"), "JRocket", "yunxiao_repo_index.json")
+INDEX_VERSION = 1
+# 与原 os.walk 逻辑一致：根目录下最多向下找两层仓库
+MAX_REPO_DEPTH = 2
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _list_directory(path):
+    """返回 (是否为仓库, 可继续下钻的子目录名)。"""
+    is_repo = False
+    children = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if not entry.is_dir():
+                    continue
+            except OSError:
+                continue
+            if entry.name == ".git":
+                is_repo = True
+            elif not entry.is_symlink():
+                children.append(entry.name)
+    children.sort()
+    return is_repo, children
+
+
+def _is_under(path, roots):
+    for root in roots:
+        if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+            return True
+    return False
+
+
+class RepoIndex:
+    """本地仓库索引，按目录 mtime 增量刷新，持久化到 ~/JRocket/ 下。"""
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.dirs = {}
+        self.repos = {}
+
+    def load(self):
+        self.loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except Exception:
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        self.dirs = data.get("dirs", {})
+        self.repos = data.get("repos", {})
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {"version": INDEX_VERSION, "dirs": self.dirs, "repos": self.repos}
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def refresh(self, roots):
+        """
+        增量刷新并返回 (仓库列表, 不存在的根目录, [(仓库路径, 错误信息)])。
+        仓库按遍历顺序返回，不做去重，由调用方按需处理。
+        """
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            repositories = []
+            missing_roots = []
+            failures = []
+            visited_dirs = set()
+            visited_repos = set()
+            existing_roots = []
+            changed = False
+            for root in roots:
+                if not os.path.isdir(root):
+                    missing_roots.append(root)
+                    continue
+                existing_roots.append(root)
+                stack = [(root, 0)]
+                while stack:
+                    current, depth = stack.pop()
+                    visited_dirs.add(current)
+                    mtime = _mtime(current)
+                    cached = self.dirs.get(current)
+                    if cached is None or cached.get("mtime") != mtime:
+                        try:
+                            is_repo, children = _list_directory(current)
+                        except OSError:
+                            continue
+                        cached = {"mtime": mtime, "is_repo": is_repo, "children": children}
+                        self.dirs[current] = cached
+                        changed = True
+                    if cached["is_repo"]:
+                        visited_repos.add(current)
+                        entry, entry_changed = self._repo_entry(current, root)
+                        changed = changed or entry_changed
+                        if isinstance(entry, dict):
+                            repositories.append(entry)
+                        else:
+                            failures.append((current, entry))
+                        continue
+                    if depth >= MAX_REPO_DEPTH:
+                        continue
+                    for name in reversed(cached["children"]):
+                        stack.append((os.path.join(current, name), depth + 1))
+
+            for table, visited in ((self.dirs, visited_dirs), (self.repos, visited_repos)):
+                for path in [path for path in table if path not in visited and _is_under(path, existing_roots)]:
+                    del table[path]
+                    changed = True
+            if changed:
+                try:
+                    self.save()
+                except OSError:
+                    pass
+            return [dict(entry) for entry in repositories], missing_roots, failures
+
+    def _repo_entry(self, repo, root):
+        git_mtime = _mtime(os.path.join(repo, ".git"))
+        cached = self.repos.get(repo)
+        if cached and cached.get("git_mtime") == git_mtime:
+            return cached, False
+        try:
+            remote_url = normalize_yunxiao_codeup_url(run_git(repo, ["remote", "get-url", "origin"]))
+        except Exception as exc:
+            self.repos.pop(repo, None)
+            return str(exc), cached is not None
+        entry = {
+            "path": repo,
+            "repo_name": os.path.basename(repo),
+            "workspace": os.path.basename(os.path.dirname(repo)),
+            "root": root,
+            "remote_url": remote_url,
+            "match_key": normalize_for_match(remote_url),
+            "git_mtime": git_mtime,
+        }
+        self.repos[repo] = entry
+        return entry, True
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_repo_index(path=INDEX_PATH):
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = RepoIndex(path)
+            _indexes[path] = index
+        return index
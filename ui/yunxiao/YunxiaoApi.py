@@ -0,0 +1,38 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_TIMEOUT = 20
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def api_headers(token):
+    return {"Content-Type": "application/json", "x-yunxiao-token": token}
+
+
+def create_client(pool_maxsize=POOL_MAXSIZE):
+    """
+    创建云效 OpenAPI 使用的 requests.Session，不读取系统代理。
+    连接池满时阻塞等待，每个主机最多 pool_maxsize 条连接，可以在线程间共用。
+    """
+    session = requests.Session()
+    session.trust_env = False
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_maxsize, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_client():
+    """进程内共用的客户端，界面里的各个 worker 和脚本都从这里取，连接和 TLS 会话在它们之间复用。"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = create_client()
+        return _shared_client
@@ -0,0 +1,186 @@
+import os
+import re
+import subprocess
+import threading
+
+
+def run_git(repo_path, args, timeout=8):
+    process = subprocess.Popen(
+        ["git", "-C", repo_path] + args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    stdout, stderr = process.communicate(timeout=timeout)
+    if process.returncode != 0:
+        raise RuntimeError(stderr.strip() or stdout.strip())
+    return stdout.strip()
+
+
+def normalize_branch_name(branch):
+    branch = (branch or "").strip()
+    for prefix in ("remotes/origin/", "origin/"):
+        if branch.startswith(prefix):
+            return branch[len(prefix):]
+    return branch
+
+
+_packed_refs_cache = {}
+_packed_refs_lock = threading.Lock()
+
+
+def read_packed_refs(git_dir):
+    packed_path = os.path.join(git_dir, "packed-refs")
+    try:
+        mtime = os.stat(packed_path).st_mtime_ns
+    except OSError:
+        return frozenset()
+    with _packed_refs_lock:
+        cached = _packed_refs_cache.get(git_dir)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    refs = set()
+    with open(packed_path, "r", encoding="utf-8", errors="replace") as file:
+        for line in file:
+            if line.startswith(("#", "^")):
+                continue
+            _, _, ref = line.strip().partition(" ")
+            if ref:
+                refs.add(ref)
+    refs = frozenset(refs)
+    with _packed_refs_lock:
+        _packed_refs_cache[git_dir] = (mtime, refs)
+    return refs
+
+
+# git check-ref-format 不允许的字符：控制字符、空格和 ~^:?*[\
+INVALID_REF_CHARS = re.compile(r"[\x00-\x20\x7f~^:?*\[\\]")
+
+
+def is_safe_refname(ref):
+    """按 git 引用命名规则检查，不合规的名字不能拼成 .git 下的文件路径。"""
+    if not ref or ref.startswith("/") or ref.endswith(("/", ".")) or ref == "@":
+        return False
+    if ".." in ref or "//" in ref or "@{" in ref or INVALID_REF_CHARS.search(ref):
+        return False
+    return all(part and not part.startswith(".") and not part.endswith(".lock") for part in ref.split("/"))
+
+
+def ref_exists(repo_path, ref):
+    """
+    直接读取 .git 下的 loose ref 和 packed-refs 判断引用是否存在。
+    worktree、子模块（.git 为文件）或 reftable 等布局无法直接读取，或引用名不合规时返回 None，
+    由调用方交给 git show-ref 判断。
+    """
+    if not is_safe_refname(ref):
+        return None
+    git_dir = os.path.join(repo_path, ".git")
+    if not os.path.isdir(git_dir) or os.path.isdir(os.path.join(git_dir, "reftable")):
+        return None
+    try:
+        with open(os.path.join(git_dir, *ref.split("/")), "r", encoding="utf-8", errors="replace") as file:
+            if file.read(1):
+                return True
+    except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+        pass
+    except OSError:
+        return None
+    try:
+        return ref in read_packed_refs(git_dir)
+    except OSError:
+        return None
+
+
+def git_ref_exists(repo_path, ref):
+    process = subprocess.run(
+        ["git", "-C", repo_path, "show-ref", "--verify", "--quiet", ref],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return process.returncode == 0
+
+
+def repo_has_branch(repo_path, branch):
+    branch = normalize_branch_name(branch)
+    if not branch:
+        return False
+    for ref in (f"refs/heads/{branch}", f"refs/remotes/origin/{branch}"):
+        exists = ref_exists(repo_path, ref)
+        if exists is None:
+            exists = git_ref_exists(repo_path, ref)
+        if exists:
+            return True
+    return False
+
+
+def branch_for_commit(repo_path, short_hash):
+    try:
+        output = run_git(repo_path, ["branch", "--all", "--contains", short_hash, "--format=%(refname:short)"])
+        branches = [normalize_branch_name(line.strip()) for line in output.splitlines() if line.strip()]
+        for branch in branches:
+            if not branch.startswith("remotes/") and branch != "HEAD":
+                return branch
+        for branch in branches:
+            if branch.startswith("origin/"):
+                return normalize_branch_name(branch)
+        if branches:
+            return normalize_branch_name(branches[0])
+    except Exception:
+        pass
+    return normalize_branch_name(run_git(repo_path, ["rev-parse", "--abbrev-ref", "HEAD"]))
+
+
+def branch_refs_in_preference_order(repo_path):
+    # 与 git branch --all 的顺序一致：先本地分支，再远程分支，各自按名称排序
+    output = run_git(
+        repo_path,
+        ["for-each-ref", "--format=%(objectname)%09%(refname)", "refs/heads", "refs/remotes"],
+    )
+    refs = []
+    for line in output.splitlines():
+        commit_hash, _, refname = line.partition("\t")
+        if not commit_hash or refname.endswith("/HEAD"):
+            continue
+        for prefix in ("refs/heads/", "refs/remotes/"):
+            if refname.startswith(prefix):
+                refs.append((normalize_branch_name(refname[len(prefix):]), commit_hash))
+                break
+    return refs
+
+
+def resolve_commit_branches(repo_path, commit_hashes, since=None):
+    """
+    一次性解析多个提交所在的分支，返回 {完整提交哈希: 分支名}。
+    按分支优先顺序依次从分支头沿父提交遍历，每个提交归属第一个能到达它的分支，
+    结果与逐个执行 branch_for_commit 相同；图里找不到的提交回退到 branch_for_commit。
+    """
+    pending = set(commit_hashes)
+    result = {}
+    try:
+        refs = branch_refs_in_preference_order(repo_path)
+        args = ["rev-list", "--parents", "--branches", "--remotes"]
+        if since:
+            args.append(f"--since={since}")
+        parents = {}
+        for line in run_git(repo_path, args, timeout=20).splitlines():
+            commit_hash, *commit_parents = line.split()
+            parents[commit_hash] = commit_parents
+        visited = set()
+        for branch, tip in refs:
+            if not pending:
+                break
+            stack = [tip]
+            while stack:
+                commit_hash = stack.pop()
+                if commit_hash in visited or commit_hash not in parents:
+                    continue
+                visited.add(commit_hash)
+                if commit_hash in pending:
+                    pending.discard(commit_hash)
+                    result[commit_hash] = branch
+                stack.extend(parents[commit_hash])
+    except Exception:
+        pass
+    for commit_hash in pending:
+        result[commit_hash] = branch_for_commit(repo_path, commit_hash)
+    return result
@@ -1,20 +1,46 @@
 #!/usr/bin/env python3
+import heapq
+import itertools
 import json
 import os
+import random
 import re
-import subprocess
+import sqlite3
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from urllib.parse import urlparse
 
 import requests
 from PyQt5 import QtCore, QtGui, QtWidgets
+from urllib3.exceptions import NewConnectionError
 
 from ui.log_out.LogPage import LogPage
+from ui.yunxiao.AcrImageLog import AcrImageLogParser
+from ui.yunxiao.BranchPlan import PLAN_PATH, build_branch_plan, save_branch_plan
+from ui.yunxiao.HistoryStore import (
+    HISTORY_COLUMNS,
+    HISTORY_FIELDS,
+    HISTORY_PAGE_SIZE,
+    MEMORY_DB_PATH,
+    HistoryStore,
+    HistoryStoreClosed,
+)
+from ui.yunxiao.MappingIndex import MappingIndex
+from ui.yunxiao.PayloadWalk import find_run_id, iter_strings, pipeline_children, walk, walk_with_path
+from ui.yunxiao.PipelineCache import PipelineCache, payload_fingerprint, pipeline_updated_marker
+from ui.yunxiao.RecordTable import CopyableTableView, RecordTableModel, TableRecord
+from ui.yunxiao.RepoIndex import get_repo_index
+from ui.yunxiao.YunxiaoApi import DEFAULT_TIMEOUT, api_headers, get_client
+from ui.yunxiao.YunxiaoGit import normalize_branch_name, resolve_commit_branches, run_git
+from ui.yunxiao.YunxiaoUrls import (
+    normalize_for_match,
+    normalize_yunxiao_codeup_url,
+    repo_name_from_text,
+    repo_path_from_remote,
+)
 
 
 CONFIG_PATH = os.path.join(os.path.expanduser("~"), "JRocket", "yunxiao_config.json")
-HISTORY_PATH = os.path.join(os.path.expanduser("~"), "JRocket", "yunxiao_history.json")
 TOKEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "yunxiaotoken.txt")
 DEFAULT_ORG_URL = "https://sovell-cn-shanghai.devops.aliyuncs.com"
 DEFAULT_ROOTS = [
@@ -22,21 +48,46 @@ DEFAULT_ROOTS = [
     "/Users/devjys/Desktop/WorkSpaces/sovell/sovell11~14",
     "/Users/devjys/Desktop/WorkSpaces/sovell/sovell21~",
 ]
+DEFAULT_SCAN_WORKERS = 8
+SCAN_RESULT_LIMIT = 50
+PIPELINE_DETAIL_WORKERS = 8
+DEFAULT_TRIGGER_CONCURRENCY = 4
+MAX_TRIGGER_CONCURRENCY = 16
+DEFAULT_TRIGGER_RATE = 2.0
+TRIGGER_TICK_MS = 100
+TRIGGER_MAX_ATTEMPTS = 4
+TRIGGER_BACKOFF_BASE_SECONDS = 2
+TRIGGER_BACKOFF_MAX_SECONDS = 60
+TRIGGER_RETRY_STATUSES = {429, 503}
+PIPELINE_PAGE_SIZE = 100
+PIPELINE_MAX_PAGES = 20
+PIPELINE_PAGE_SHAPES = [
+    ("page", "pageSize"),
+    ("pageNo", "pageSize"),
+    ("current", "pageSize"),
+    ("page", "perPage"),
+]
 IMAGE_LOG_POLL_INTERVAL_SECONDS = 30
 IMAGE_LOG_MAX_POLLS = 60
-
-
-def run_git(repo_path, args, timeout=8):
-    process = subprocess.Popen(
-        ["git", "-C", repo_path] + args,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-    stdout, stderr = process.communicate(timeout=timeout)
-    if process.returncode != 0:
-        raise RuntimeError(stderr.strip() or stdout.strip())
-    return stdout.strip()
+IMAGE_POLL_TICK_MS = 1000
+IMAGE_POLL_TIMEOUT_SECONDS = IMAGE_LOG_POLL_INTERVAL_SECONDS * IMAGE_LOG_MAX_POLLS
+IMAGE_POLL_BACKOFF_BASE_SECONDS = 15
+IMAGE_POLL_BACKOFF_MAX_SECONDS = 240
+ACR_JOB_FINISHED_STATUSES = {"SUCCESS", "FAIL", "FAILED", "CANCELED", "CANCELLED", "SKIPPED", "TIMEOUT", "ERROR"}
+ACR_JOB_QUEUED_STATUSES = {"INIT", "QUEUED", "QUEUE", "WAITING", "PENDING"}
+RUN_DETAIL_ENDPOINTS = ("", "/jobs", "/logs")
+COMMIT_COLUMNS = [
+    ("committed_at", "时间"),
+    ("workspace", "工作区"),
+    ("repo_name", "仓库"),
+    ("branch", "分支"),
+    ("commit_summary", "提交"),
+    ("author", "作者"),
+    ("pipeline", "流水线"),
+    ("pipeline_source", "来源"),
+    ("status", "状态"),
+    ("build_url", "构建地址"),
+]
 
 
 def load_yunxiao_token():
@@ -52,55 +103,6 @@ def load_yunxiao_token():
     return os.environ.get("YUNXIAO_TOKEN", "")
 
 
-def normalize_remote_url(remote_url):
-    remote_url = (remote_url or "").strip()
-    if remote_url.startswith("git@"):
-        match = re.match(r"git@([^:]+):(.+)", remote_url)
-        if match:
-            return f"https://{match.group(1)}/{match.group(2)}"
-    if remote_url.startswith("ssh://git@"):
-        parsed = urlparse(remote_url)
-        path = parsed.path.lstrip("/")
-        return f"https://{parsed.hostname}/{path}"
-    return remote_url
-
-
-def normalize_yunxiao_codeup_url(remote_url):
-    remote_url = normalize_remote_url(remote_url)
-    parsed = urlparse(remote_url)
-    if not parsed.scheme or not parsed.netloc:
-        return remote_url
-    path = parsed.path
-    if "devops.aliyuncs.com" in parsed.netloc and path.startswith("/codeup/sovell/"):
-        path = path.replace("/codeup/sovell/", "/codeup/", 1)
-        return parsed._replace(path=path).geturl()
-    return remote_url
-
-
-def normalize_for_match(value):
-    value = normalize_yunxiao_codeup_url(value or "").lower().rstrip("/")
-    if value.endswith(".git"):
-        value = value[:-4]
-    return value
-
-
-def repo_path_from_remote(remote_url):
-    normalized = normalize_yunxiao_codeup_url(remote_url)
-    parsed = urlparse(normalized)
-    path = parsed.path.lstrip("/") if parsed.path else normalized
-    path = path.lower().rstrip("/")
-    if path.endswith(".git"):
-        path = path[:-4]
-    return path
-
-
-def repo_name_from_text(value):
-    normalized = normalize_for_match(value)
-    if not normalized:
-        return ""
-    return normalized.split("/")[-1]
-
-
 def mapping_matches_repo(mapping, remote_url, repo_name, allow_repo_name=False):
     key = mapping.get("key", "").strip()
     if not key:
@@ -119,85 +121,18 @@ def mapping_matches_repo(mapping, remote_url, repo_name, allow_repo_name=False):
     return False
 
 
-def match_pipeline(remote_url, repo_name, manual_mappings, automatic_mappings):
-    for mapping in manual_mappings:
-        pipeline_id = mapping.get("pipeline_id", "").strip()
-        if pipeline_id and mapping_matches_repo(mapping, remote_url, repo_name, allow_repo_name=True):
-            return pipeline_id, "手动映射"
-    for mapping in automatic_mappings:
-        pipeline_id = mapping.get("pipeline_id", "").strip()
-        if pipeline_id and mapping_matches_repo(mapping, remote_url, repo_name):
-            name = mapping.get("pipeline_name", "").strip()
-            return pipeline_id, f"OpenAPI: {name}" if name else "OpenAPI"
-    exact_name_mappings = []
-    repo_short_key = normalize_for_match(repo_name)
-    for mapping in automatic_mappings:
-        pipeline_id = mapping.get("pipeline_id", "").strip()
-        mapping_repo_name = normalize_for_match(mapping.get("repo_name", ""))
-        mapping_key_name = repo_name_from_text(mapping.get("key", ""))
-        if pipeline_id and repo_short_key and repo_short_key in (mapping_repo_name, mapping_key_name):
-            exact_name_mappings.append(mapping)
-    if len(exact_name_mappings) == 1:
-        mapping = exact_name_mappings[0]
-        name = mapping.get("pipeline_name", "").strip()
-        return mapping.get("pipeline_id", "").strip(), f"OpenAPI: {name}" if name else "OpenAPI"
-    return "", ""
-
-
-def normalize_branch_name(branch):
-    branch = (branch or "").strip()
-    for prefix in ("remotes/origin/", "origin/"):
-        if branch.startswith(prefix):
-            return branch[len(prefix):]
-    return branch
-
-
-def branch_for_commit(repo_path, short_hash):
-    try:
-        output = run_git(repo_path, ["branch", "--all", "--contains", short_hash, "--format=%(refname:short)"])
-        branches = [normalize_branch_name(line.strip()) for line in output.splitlines() if line.strip()]
-        for branch in branches:
-            if not branch.startswith("remotes/") and branch != "HEAD":
-                return branch
-        for branch in branches:
-            if branch.startswith("origin/"):
-                return normalize_branch_name(branch)
-        if branches:
-            return normalize_branch_name(branches[0])
-    except Exception:
-        pass
-    return normalize_branch_name(run_git(repo_path, ["rev-parse", "--abbrev-ref", "HEAD"]))
+def match_pipeline(remote_url, repo_name, mapping_index):
+    mapping, source = mapping_index.match(remote_url, repo_name)
+    if not mapping:
+        return "", ""
+    return (mapping.get("pipeline_id") or "").strip(), pipeline_source_label(source, mapping.get("pipeline_name"))
 
 
-def repo_has_branch(repo_path, branch):
-    branch = normalize_branch_name(branch)
-    if not branch:
-        return False
-    for ref in (f"refs/heads/{branch}", f"refs/remotes/origin/{branch}"):
-        process = subprocess.run(
-            ["git", "-C", repo_path, "show-ref", "--verify", "--quiet", ref],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        if process.returncode == 0:
-            return True
-    return False
-
-
-def collect_strings(value):
-    if isinstance(value, str):
-        return [value]
-    if isinstance(value, dict):
-        result = []
-        for child in value.values():
-            result.extend(collect_strings(child))
-        return result
-    if isinstance(value, list):
-        result = []
-        for child in value:
-            result.extend(collect_strings(child))
-        return result
-    return []
+def pipeline_source_label(source, pipeline_name=""):
+    if source == "manual":
+        return "手动映射"
+    name = (pipeline_name or "").strip()
+    return f"OpenAPI: {name}" if name else "OpenAPI"
 
 
 def pipeline_id_from_item(item):
@@ -220,23 +155,12 @@ def pipeline_display_name(item):
 
 
 def collect_pipeline_items(payload):
-    items = []
-    if isinstance(payload, dict):
-        if pipeline_id_from_item(payload):
-            items.append(payload)
-        for key in ("data", "result", "items", "list", "pipelines", "records", "content"):
-            if key in payload:
-                items.extend(collect_pipeline_items(payload[key]))
-        return items
-    if isinstance(payload, list):
-        for value in payload:
-            items.extend(collect_pipeline_items(value))
-    return items
+    return [node for node in walk(payload, pipeline_children) if isinstance(node, dict) and pipeline_id_from_item(node)]
 
 
 def extract_repo_refs(item):
     refs = []
-    for text in collect_strings(item):
+    for text in iter_strings(item):
         text = text.strip()
         if not text:
             continue
@@ -285,26 +209,15 @@ def pipeline_item_contains_remote(item, remote_url):
 def collect_local_repositories(roots):
     repositories = []
     seen = set()
-    for root in roots:
-        if not os.path.isdir(root):
+    entries, _missing_roots, failures = get_repo_index().refresh(roots)
+    for repo, error in failures:
+        LogPage.log(f"[云效] 读取本地仓库失败 {repo}: {error}")
+    for entry in entries:
+        key = entry["match_key"]
+        if key in seen:
             continue
-        for current, dirs, _files in os.walk(root):
-            if ".git" not in dirs:
-                if current.count(os.sep) - root.count(os.sep) >= 2:
-                    dirs[:] = []
-                continue
-            repo = current
-            dirs[:] = []
-            try:
-                remote_url = normalize_yunxiao_codeup_url(run_git(repo, ["remote", "get-url", "origin"]))
-                repo_name = os.path.basename(repo)
-                key = normalize_for_match(remote_url)
-                if key in seen:
-                    continue
-                seen.add(key)
-                repositories.append({"repo_name": repo_name, "remote_url": remote_url})
-            except Exception as exc:
-                LogPage.log(f"[云效] 读取本地仓库失败 {repo}: {exc}")
+        seen.add(key)
+        repositories.append({"repo_name": entry["repo_name"], "remote_url": entry["remote_url"]})
     return repositories
 
 
@@ -351,13 +264,22 @@ def first_pipeline_mapping_for_repo(session, org_url, headers, repo, timeout):
     return None
 
 
-def fetch_pipeline_mappings_from_openapi(org_url, token, roots=None, timeout=15):
+def fetch_pipeline_mappings_from_openapi(
+    org_url,
+    token,
+    roots=None,
+    timeout=DEFAULT_TIMEOUT,
+    progress=None,
+    max_workers=PIPELINE_DETAIL_WORKERS,
+    cache=None,
+    pagination=None,
+    on_pagination=None,
+):
     if not token:
         raise RuntimeError(f"请输入 YUNXIAO_TOKEN，或在 {TOKEN_PATH} 写入 token")
 
-    session = requests.Session()
-    session.trust_env = False
-    headers = {"x-yunxiao-token": token}
+    session = get_client()
+    headers = api_headers(token)
     org_url = org_url.rstrip("/")
     url = f"{org_url}/oapi/v1/flow/pipelines"
     errors = []
@@ -365,6 +287,15 @@ def fetch_pipeline_mappings_from_openapi(org_url, token, roots=None, timeout=15)
     seen = set()
     pipeline_items = []
     pipeline_ids = []
+    pipeline_markers = {}
+    cache = cache if cache is not None else PipelineCache()
+
+    def append_mapping(mapping):
+        key = (normalize_for_match(mapping["key"]), mapping["pipeline_id"])
+        if key in seen:
+            return
+        seen.add(key)
+        mappings.append(mapping)
 
     def append_payload_mappings(payload):
         for item in collect_pipeline_items(payload):
@@ -372,12 +303,9 @@ def fetch_pipeline_mappings_from_openapi(org_url, token, roots=None, timeout=15)
             pipeline_id = pipeline_id_from_item(item)
             if pipeline_id and pipeline_id not in pipeline_ids:
                 pipeline_ids.append(pipeline_id)
+                pipeline_markers[pipeline_id] = pipeline_updated_marker(item)
             for mapping in mapping_from_pipeline_item(item):
-                key = (normalize_for_match(mapping["key"]), mapping["pipeline_id"])
-                if key in seen:
-                    continue
-                seen.add(key)
-                mappings.append(mapping)
+                append_mapping(mapping)
 
     try:
         response = session.get(url, headers=headers, timeout=timeout)
@@ -388,49 +316,191 @@ def fetch_pipeline_mappings_from_openapi(org_url, token, roots=None, timeout=15)
     except Exception as exc:
         errors.append(f"{{}}: {exc}")
 
-    page_shapes = [
-        ("page", "pageSize"),
-        ("pageNo", "pageSize"),
-        ("current", "pageSize"),
-    ]
+    def fetch_page(page_key, size_key, page):
+        params = {page_key: page, size_key: PIPELINE_PAGE_SIZE}
+        try:
+            response = session.get(url, headers=headers, params=params, timeout=timeout)
+        except Exception as exc:
+            raise RuntimeError(f"{params}: {exc}")
+        if not (200 <= response.status_code < 300):
+            raise RuntimeError(f"HTTP {response.status_code} params={params}")
+        return response
+
+    def payload_pipeline_ids(payload):
+        return {pipeline_id_from_item(item) for item in collect_pipeline_items(payload)} - {""}
+
+    def header_total_pages(response):
+        try:
+            return int(response.headers.get("X-Total-Pages") or 0)
+        except ValueError:
+            return 0
+
+    def same_page(first_payload, second_payload):
+        # 第二页和第一页相同，说明服务端不认这组分页参数
+        second_ids = payload_pipeline_ids(second_payload)
+        return bool(second_ids) and second_ids <= payload_pipeline_ids(first_payload)
+
+    # 上次探测到的分页参数优先，探测成功后只按这一种方式翻页；只对同一个组织生效
+    if pagination and pagination.get("org_url", org_url) != org_url:
+        pagination = None
+    page_shapes = list(PIPELINE_PAGE_SHAPES)
+    if pagination and pagination.get("single_page"):
+        # 上次探测发现服务端不分页，不带参数的请求已拿到全部流水线
+        page_shapes = []
+    elif pagination:
+        remembered = (pagination.get("page_key"), pagination.get("size_key"))
+        if all(remembered):
+            page_shapes = [remembered] + [shape for shape in page_shapes if shape != remembered]
+    ignored_shapes = 0
+    # 探测失败只说明这组参数没试成，不代表列表缺页，不影响清理缓存
+    probe_errors = []
+    list_complete = False
     for page_key, size_key in page_shapes:
-        unchanged_pages = 0
-        for page in range(1, 21):
-            before = len(pipeline_ids)
-            params = {page_key: page, size_key: 100}
+        try:
+            first_response = fetch_page(page_key, size_key, 1)
+            first_payload = first_response.json()
+        except Exception as exc:
+            probe_errors.append(str(exc))
+            continue
+        total_pages = min(header_total_pages(first_response), PIPELINE_MAX_PAGES)
+        if total_pages != 1:
             try:
-                response = session.get(url, headers=headers, params=params, timeout=timeout)
-                if not (200 <= response.status_code < 300):
-                    errors.append(f"HTTP {response.status_code} params={params}")
-                    break
-                payload = response.json()
-                append_payload_mappings(payload)
-                if len(pipeline_ids) == before:
-                    unchanged_pages += 1
-                else:
-                    unchanged_pages = 0
-                if unchanged_pages >= 2:
-                    break
+                second_payload = fetch_page(page_key, size_key, 2).json()
             except Exception as exc:
-                errors.append(f"{params}: {exc}")
-                break
+                probe_errors.append(str(exc))
+                continue
+            if same_page(first_payload, second_payload):
+                ignored_shapes += 1
+                continue
+        append_payload_mappings(first_payload)
+        if total_pages > 1:
+            append_payload_mappings(second_payload)
 
-    for pipeline_id in pipeline_ids[:300]:
-        before = len(seen)
+            # 已知总页数，剩余页并发获取后按页码顺序合并
+            def fetch_page_payload(page):
+                try:
+                    return fetch_page(page_key, size_key, page).json()
+                except Exception as exc:
+                    errors.append(str(exc))
+                    return None
+
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                payloads = list(executor.map(fetch_page_payload, range(3, total_pages + 1)))
+            for payload in payloads:
+                if payload is not None:
+                    append_payload_mappings(payload)
+        elif not total_pages:
+            append_payload_mappings(second_payload)
+            # 没有总页数时一直翻到空页，或连续两页没有新流水线为止
+            page_payload = second_payload
+            unchanged_pages = 0
+            page = 3
+            while payload_pipeline_ids(page_payload) and page <= PIPELINE_MAX_PAGES and unchanged_pages < 2:
+                before = len(pipeline_ids)
+                try:
+                    page_payload = fetch_page(page_key, size_key, page).json()
+                except Exception as exc:
+                    errors.append(str(exc))
+                    break
+                append_payload_mappings(page_payload)
+                unchanged_pages = unchanged_pages + 1 if len(pipeline_ids) == before else 0
+                page += 1
+        if on_pagination:
+            on_pagination({"org_url": org_url, "page_key": page_key, "size_key": size_key})
+        list_complete = True
+        break
+    else:
+        list_complete = ignored_shapes == len(page_shapes)
+        if page_shapes and ignored_shapes == len(page_shapes) and on_pagination:
+            # 每组参数都被忽略：流水线只有一页，记住结果，之后刷新不再探测
+            on_pagination({"org_url": org_url, "single_page": True})
+
+    listed_keys = frozenset(seen)
+
+    def payload_mappings(payload):
+        return [mapping for item in collect_pipeline_items(payload) for mapping in mapping_from_pipeline_item(item)]
+
+    def fetch_pipeline_details(pipeline_id):
+        cached = cache.get(pipeline_id) or {}
+        marker = pipeline_markers.get(pipeline_id, "")
+        # 列表里的更新时间没变，直接复用上次解析出的映射
+        if marker and cached.get("updated") == marker:
+            return cached, True
+        entry = {"updated": marker, "sources": {}}
         detail_urls = [
-            f"{org_url}/oapi/v1/flow/pipelines/{pipeline_id}",
-            f"{org_url}/oapi/v1/flow/pipelines/{pipeline_id}/sources",
+            ("detail", f"{org_url}/oapi/v1/flow/pipelines/{pipeline_id}"),
+            ("sources", f"{org_url}/oapi/v1/flow/pipelines/{pipeline_id}/sources"),
         ]
-        for detail_url in detail_urls:
+        reused = True
+        complete = True
+        for name, detail_url in detail_urls:
+            cached_source = cached.get("sources", {}).get(name) or {}
+            request_headers = dict(headers)
+            if cached_source.get("etag"):
+                request_headers["If-None-Match"] = cached_source["etag"]
+            if cached_source.get("last_modified"):
+                request_headers["If-Modified-Since"] = cached_source["last_modified"]
             try:
-                response = session.get(detail_url, headers=headers, timeout=timeout)
-                if not (200 <= response.status_code < 300):
-                    continue
-                append_payload_mappings(response.json())
-                if len(seen) > before:
-                    break
+                response = session.get(detail_url, headers=request_headers, timeout=timeout)
+                if response.status_code == 304 and cached_source:
+                    source = cached_source
+                elif 200 <= response.status_code < 300:
+                    fingerprint = payload_fingerprint(response.content)
+                    if cached_source and cached_source.get("fingerprint") == fingerprint:
+                        source = dict(cached_source)
+                    else:
+                        reused = False
+                        source = {"fingerprint": fingerprint, "mappings": payload_mappings(response.json())}
+                    source["etag"] = response.headers.get("ETag", "")
+                    source["last_modified"] = response.headers.get("Last-Modified", "")
+                else:
+                    source = None
             except Exception:
+                source = None
+            if source is None:
+                # 请求失败时沿用上次的结果，且不记录更新时间，下次刷新仍会重新请求
+                complete = False
+                if cached_source:
+                    entry["sources"][name] = cached_source
                 continue
+            entry["sources"][name] = source
+            # 详情里已经解析出新的映射就不再请求 /sources
+            if any(
+                (normalize_for_match(mapping["key"]), mapping["pipeline_id"]) not in listed_keys
+                for mapping in source.get("mappings", [])
+            ):
+                break
+        if not complete:
+            entry["updated"] = ""
+        return entry, reused
+
+    detail_ids = pipeline_ids[:300]
+    detail_entries = {}
+    reused_count = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(fetch_pipeline_details, pipeline_id): pipeline_id for pipeline_id in detail_ids}
+        for done, future in enumerate(as_completed(futures), start=1):
+            entry, reused = future.result()
+            detail_entries[futures[future]] = entry
+            reused_count += 1 if reused else 0
+            if progress:
+                progress(done, len(detail_ids))
+    # 按流水线原始顺序合并，保证映射顺序与去重结果稳定
+    for pipeline_id in detail_ids:
+        entry = detail_entries.get(pipeline_id, {})
+        for source in entry.get("sources", {}).values():
+            for mapping in source.get("mappings", []):
+                append_mapping(mapping)
+        if entry.get("sources"):
+            cache.put(pipeline_id, entry)
+    # 只有完整拿到流水线列表时才清理已删除流水线的缓存
+    if list_complete and not errors:
+        cache.retain(pipeline_ids)
+    try:
+        cache.save()
+    except OSError as exc:
+        LogPage.log(f"[云效] 保存流水线缓存失败: {exc}")
+    LogPage.log(f"[云效] 流水线详情: 未变化 {reused_count} 条，重新解析 {len(detail_ids) - reused_count} 条")
 
     for repo in collect_local_repositories(roots or []):
         mapping = first_pipeline_mapping_for_repo(session, org_url, headers, repo, timeout)
@@ -442,8 +512,8 @@ def fetch_pipeline_mappings_from_openapi(org_url, token, roots=None, timeout=15)
         seen.add(key)
         mappings.append(mapping)
 
-    if not mappings and errors:
-        raise RuntimeError("; ".join(errors[-3:]))
+    if not mappings and (errors or probe_errors):
+        raise RuntimeError("; ".join((errors + probe_errors)[-3:]))
     if not mappings and pipeline_items:
         raise RuntimeError(
             f"OpenAPI 返回了 {len(pipeline_items)} 条流水线，但返回内容里没有解析到仓库地址。"
@@ -452,75 +522,51 @@ def fetch_pipeline_mappings_from_openapi(org_url, token, roots=None, timeout=15)
     return mappings
 
 
-def extract_image_addresses(payload):
-    text = "\n".join(collect_strings(payload))
-    patterns = [
-        r"[\w.-]+(?:-registry)?\.[\w.-]+\.aliyuncs\.com/[A-Za-z0-9._/@:-]+",
-        r"registry(?:\.[\w.-]+)+/[A-Za-z0-9._/@:-]+",
-        r"docker\.io/[A-Za-z0-9._/@:-]+",
-        r"harbor(?:\.[\w.-]+)+/[A-Za-z0-9._/@:-]+",
-    ]
-    images = []
-    for pattern in patterns:
-        images.extend(re.findall(pattern, text))
-    cleaned = []
-    for image in images:
-        image = image.rstrip(".,;)'\"]")
-        if image not in cleaned:
-            cleaned.append(image)
-    return cleaned
-
-
-def extract_final_acr_images(log_text):
-    result = {"x86": "", "arm": ""}
-    repository = ""
-    digest_tags = []
-    for line in (log_text or "").splitlines():
-        repo_match = re.search(r"The push refers to repository \[([^\]]+)\]", line)
-        if repo_match:
-            repository = repo_match.group(1).strip()
-        tag_match = re.search(r"\b([A-Za-z0-9_.-]+\.(?:x86_64|aarch64|arm64|arm)):\s+digest:\s+sha256:", line)
-        if tag_match:
-            digest_tags.append(tag_match.group(1).strip())
+def acr_job_status(node):
+    return str(node.get("status") or node.get("jobStatus") or node.get("state") or "").upper()
 
-    if not repository:
-        return result
 
-    for tag in digest_tags:
-        image = f"{repository}:{tag}"
-        if tag.endswith("x86_64"):
-            result["x86"] = image
-        elif tag.endswith(("aarch64", "arm64", "arm")):
-            result["arm"] = image
-    return result
-
-
-def collect_acr_job_ids(payload):
-    jobs = {"x86": [], "arm": []}
-
-    def walk(node):
-        if isinstance(node, dict):
-            name = str(node.get("name") or node.get("ENGINE_TASK_NAME") or "")
-            job_id = node.get("id")
-            if job_id and "镜像构建并推送至ACR" in name:
-                if "x86" in name:
-                    jobs["x86"].append(str(job_id))
-                elif "arm" in name:
-                    jobs["arm"].append(str(job_id))
-            for child in node.values():
-                walk(child)
-        elif isinstance(node, list):
-            for child in node:
-                walk(child)
-
-    walk(payload)
-    return {key: list(dict.fromkeys(value)) for key, value in jobs.items()}
+def collect_acr_jobs(payload, paths=None):
+    """
+    返回 {"x86": {jobId: 状态}, "arm": {...}}，状态取不到时为空字符串。
+    传入 paths 时记录每个任务节点在返回里的位置，之后轮询可直接按位置读取状态。
+    """
+    jobs = {"x86": {}, "arm": {}}
+    for node, path in walk_with_path(payload):
+        if not isinstance(node, dict):
+            continue
+        name = str(node.get("name") or node.get("ENGINE_TASK_NAME") or "")
+        job_id = node.get("id")
+        if job_id and "镜像构建并推送至ACR" in name:
+            arch = "x86" if "x86" in name else "arm" if "arm" in name else ""
+            if arch and str(job_id) not in jobs[arch]:
+                jobs[arch][str(job_id)] = acr_job_status(node)
+                if paths is not None:
+                    paths[str(job_id)] = tuple(path)
+    return jobs
+
+
+def node_at(payload, path):
+    node = payload
+    for key in path:
+        if isinstance(node, dict) and key in node:
+            node = node[key]
+        elif isinstance(node, list) and isinstance(key, int) and key < len(node):
+            node = node[key]
+        else:
+            return None
+    return node
 
 
 class YunxiaoSignals(QtCore.QObject):
+    scan_progress = QtCore.pyqtSignal(list)
     scan_finished = QtCore.pyqtSignal(list, str)
     run_finished = QtCore.pyqtSignal(int, int, bool, str, list, str)
-    images_updated = QtCore.pyqtSignal(int, int, str, str, str)
+    run_triggered = QtCore.pyqtSignal(object)
+    run_retry = QtCore.pyqtSignal(object, float, str)
+    poll_finished = QtCore.pyqtSignal(list)
+    mappings_progress = QtCore.pyqtSignal(int, int)
+    pagination_detected = QtCore.pyqtSignal(dict)
     mappings_finished = QtCore.pyqtSignal(list, str)
 
 
@@ -550,118 +596,163 @@ class CopyableTableWidget(QtWidgets.QTableWidget):
         QtWidgets.QApplication.clipboard().setText("\n".join(lines))
 
 
-def table_item_text(item):
-    if not item:
-        return ""
-    return item.text().strip()
+class CommitRecord(TableRecord):
+    __slots__ = tuple(field for field, _ in COMMIT_COLUMNS) + ("status_ok",)
 
 
-def build_url_item(url):
-    item = QtWidgets.QTableWidgetItem(url)
-    if url:
-        item.setForeground(QtGui.QBrush(QtGui.QColor("#0969da")))
-        font = item.font()
-        font.setUnderline(True)
-        item.setFont(font)
-        item.setToolTip("双击打开构建地址")
-    return item
+class HistoryRecord(TableRecord):
+    __slots__ = ("record_id",) + tuple(HISTORY_FIELDS)
 
 
-def open_url_from_table_item(item):
-    if not item:
-        return
-    url = table_item_text(item)
-    if url.startswith(("http://", "https://")):
-        QtGui.QDesktopServices.openUrl(QtCore.QUrl(url))
+class CommitTableModel(RecordTableModel):
+    def __init__(self, parent=None):
+        super().__init__(COMMIT_COLUMNS, url_field="build_url", parent=parent)
+
+    def foreground(self, record, field):
+        if field != "status" or record.status_ok is None:
+            return None
+        return QtGui.QBrush(QtCore.Qt.darkGreen if record.status_ok else QtCore.Qt.red)
+
+
+def commit_record(row_data):
+    return CommitRecord(
+        committed_at=row_data.get("committed_at", ""),
+        workspace=row_data.get("workspace", ""),
+        repo_name=row_data.get("repo_name", ""),
+        branch=row_data.get("branch", ""),
+        commit_summary=f"{row_data.get('short_hash', '')} {row_data.get('subject', '')}".strip(),
+        author=row_data.get("author", ""),
+        pipeline=row_data.get("pipeline_id", "") or "未匹配",
+        pipeline_source=row_data.get("pipeline_source", ""),
+        status="待执行" if row_data.get("pipeline_id") else "缺少映射",
+        status_ok=None,
+    )
 
 
 class FetchPipelineMappingsWorker(QtCore.QRunnable):
-    def __init__(self, org_url, token, roots):
+    def __init__(self, org_url, token, roots, pagination=None):
         super().__init__()
         self.org_url = org_url
         self.token = token
         self.roots = roots
+        self.pagination = pagination
         self.signals = YunxiaoSignals()
 
     def run(self):
         try:
-            mappings = fetch_pipeline_mappings_from_openapi(self.org_url, self.token, self.roots)
+            mappings = fetch_pipeline_mappings_from_openapi(
+                self.org_url,
+                self.token,
+                self.roots,
+                progress=self.signals.mappings_progress.emit,
+                pagination=self.pagination,
+                on_pagination=self.signals.pagination_detected.emit,
+            )
             self.signals.mappings_finished.emit(mappings, "")
         except Exception as exc:
             self.signals.mappings_finished.emit([], str(exc))
 
 
 class ScanCommitsWorker(QtCore.QRunnable):
-    def __init__(self, roots, author, since, manual_mappings, automatic_mappings):
+    def __init__(self, roots, author, since, manual_mappings, automatic_mappings, max_workers=DEFAULT_SCAN_WORKERS):
         super().__init__()
         self.roots = roots
         self.author = author
         self.since = since
-        self.manual_mappings = manual_mappings
-        self.automatic_mappings = automatic_mappings
+        self.mapping_index = MappingIndex(manual_mappings, automatic_mappings)
+        self.max_workers = max(1, max_workers)
         self.signals = YunxiaoSignals()
 
-    def run(self):
+    def scan_repository(self, entry):
+        repo = entry["path"]
+        repo_name = entry["repo_name"]
+        remote_url = entry["remote_url"]
+        pipeline_id, pipeline_source = match_pipeline(remote_url, repo_name, self.mapping_index)
+        log_format = "%ci%x1f%H%x1f%h%x1f%an%x1f%s"
+        output = run_git(
+            repo,
+            ["log", "--all", f"--since={self.since}", f"--author={self.author}", f"--pretty=format:{log_format}"],
+            timeout=20,
+        )
+        commits = []
+        for line in output.splitlines():
+            parts = line.split("\x1f", 4)
+            if len(parts) == 5:
+                commits.append(parts)
+        if not commits:
+            return []
+        branches = resolve_commit_branches(repo, [commit[1] for commit in commits], self.since)
         rows = []
-        errors = []
-        for root in self.roots:
-            if not os.path.isdir(root):
-                errors.append(f"目录不存在: {root}")
-                continue
-            for current, dirs, _files in os.walk(root):
-                if ".git" not in dirs:
-                    if current.count(os.sep) - root.count(os.sep) >= 2:
-                        dirs[:] = []
-                    continue
-                repo = current
-                dirs[:] = []
+        for committed_at, commit_hash, short_hash, commit_author, subject in commits:
+            branch = branches[commit_hash]
+            rows.append(
+                {
+                    "committed_at": committed_at,
+                    "workspace": entry["workspace"],
+                    "repo_name": repo_name,
+                    "repo_path": repo,
+                    "remote_url": remote_url,
+                    "branch": branch,
+                    "short_hash": short_hash,
+                    "author": commit_author,
+                    "subject": subject,
+                    "pipeline_id": pipeline_id,
+                    "pipeline_source": pipeline_source,
+                }
+            )
+        return rows
+
+    def run(self):
+        # 小顶堆只保留最近的 SCAN_RESULT_LIMIT 条提交
+        top_rows = []
+        sequence = itertools.count()
+        entries, missing_roots, failures = get_repo_index().refresh(self.roots)
+        errors = [f"目录不存在: {root}" for root in missing_roots]
+        errors.extend(f"{repo}: {error}" for repo, error in failures)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.scan_repository, entry): entry for entry in entries}
+            for future in as_completed(futures):
                 try:
-                    repo_name = os.path.basename(repo)
-                    workspace = os.path.basename(os.path.dirname(repo))
-                    remote_url = normalize_yunxiao_codeup_url(run_git(repo, ["remote", "get-url", "origin"]))
-                    pipeline_id, pipeline_source = match_pipeline(
-                        remote_url,
-                        repo_name,
-                        self.manual_mappings,
-                        self.automatic_mappings,
-                    )
-                    log_format = "%ci%x1f%h%x1f%an%x1f%s"
-                    output = run_git(
-                        repo,
-                        ["log", "--all", f"--since={self.since}", f"--author={self.author}", f"--pretty=format:{log_format}"],
-                        timeout=20,
-                    )
-                    for line in output.splitlines():
-                        parts = line.split("\x1f", 3)
-                        if len(parts) != 4:
-                            continue
-                        committed_at, short_hash, commit_author, subject = parts
-                        branch = branch_for_commit(repo, short_hash)
-                        rows.append(
-                            {
-                                "committed_at": committed_at,
-                                "workspace": workspace,
-                                "repo_name": repo_name,
-                                "repo_path": repo,
-                                "remote_url": remote_url,
-                                "branch": branch,
-                                "short_hash": short_hash,
-                                "author": commit_author,
-                                "subject": subject,
-                                "pipeline_id": pipeline_id,
-                                "pipeline_source": pipeline_source,
-                            }
-                        )
+                    repo_rows = future.result()
                 except Exception as exc:
-                    errors.append(f"{repo}: {exc}")
+                    errors.append(f"{futures[future]['path']}: {exc}")
+                    continue
+                accepted = []
+                for row in repo_rows:
+                    # 时间相同时先到的排在前面，淘汰时先淘汰后到的，与表格插入顺序一致
+                    item = (row.get("committed_at", ""), -next(sequence), row)
+                    if len(top_rows) < SCAN_RESULT_LIMIT:
+                        heapq.heappush(top_rows, item)
+                    elif item[0] > top_rows[0][0]:
+                        heapq.heapreplace(top_rows, item)
+                    else:
+                        continue
+                    accepted.append(row)
+                if accepted:
+                    self.signals.scan_progress.emit(accepted)
 
-        rows.sort(key=lambda row: row.get("committed_at", ""), reverse=True)
-        self.signals.scan_finished.emit(rows[:50], "\n".join(errors))
+        rows = [item[2] for item in sorted(top_rows, key=lambda item: item[:2], reverse=True)]
+        self.signals.scan_finished.emit(rows, "\n".join(errors))
 
 
-class RunPipelineWorker(QtCore.QRunnable):
-    def __init__(self, row_index, history_row, org_url, token, pipeline_id, remote_url, branch, timeout=20):
-        super().__init__()
+def is_retryable_status(status_code):
+    # 触发接口不是幂等的：500/502/504 可能是运行已创建后网关才出错，重试会重复触发，只重试明确未受理的状态
+    return status_code in TRIGGER_RETRY_STATUSES
+
+
+def is_unsent_request_error(exc):
+    """连接没建立起来的异常，请求肯定没有发出，可以安全重试。"""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.exceptions.ConnectionError) and exc.args:
+        return isinstance(getattr(exc.args[0], "reason", exc.args[0]), NewConnectionError)
+    return False
+
+
+class PipelineTrigger:
+    """一次待触发的流水线运行，由 PipelineTriggerQueue 排队派发，限流或服务端出错时带着已尝试次数重新排队。"""
+
+    def __init__(self, row_index, history_row, org_url, token, pipeline_id, remote_url, branch, timeout=DEFAULT_TIMEOUT):
         self.row_index = row_index
         self.history_row = history_row
         self.org_url = org_url.rstrip("/")
@@ -670,23 +761,51 @@ class RunPipelineWorker(QtCore.QRunnable):
         self.remote_url = remote_url
         self.branch = normalize_branch_name(branch)
         self.timeout = timeout
+        self.attempts = 0
+        self.not_before = 0.0
+
+    def retry_delay(self, retry_after=None):
+        # 优先遵守服务端给出的 Retry-After，否则按尝试次数指数退避
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = TRIGGER_BACKOFF_BASE_SECONDS * 2 ** max(0, self.attempts - 1)
+        return min(TRIGGER_BACKOFF_MAX_SECONDS, delay) * random.uniform(1.0, 1.2)
+
+
+class RunPipelineWorker(QtCore.QRunnable):
+    def __init__(self, trigger, session):
+        super().__init__()
+        self.trigger = trigger
+        self.session = session
+        self.row_index = trigger.row_index
+        self.history_row = trigger.history_row
+        self.org_url = trigger.org_url
+        self.token = trigger.token
+        self.pipeline_id = trigger.pipeline_id
+        self.remote_url = trigger.remote_url
+        self.branch = trigger.branch
+        self.timeout = trigger.timeout
         self.signals = YunxiaoSignals()
 
     def run(self):
+        self.trigger.attempts += 1
         try:
-            session = requests.Session()
-            session.trust_env = False
             params = {
                 "runningBranchs": {self.remote_url: self.branch},
                 "comment": f"run {self.branch}",
             }
             url = f"{self.org_url}/oapi/v1/flow/pipelines/{self.pipeline_id}/runs"
-            response = session.post(
+            response = self.session.post(
                 url,
-                headers={"Content-Type": "application/json", "x-yunxiao-token": self.token},
+                headers=api_headers(self.token),
                 json={"params": json.dumps(params, ensure_ascii=False)},
                 timeout=self.timeout,
             )
+            if is_retryable_status(response.status_code) and self.trigger.attempts < TRIGGER_MAX_ATTEMPTS:
+                delay = self.trigger.retry_delay(response.headers.get("Retry-After"))
+                self.signals.run_retry.emit(self.trigger, delay, f"HTTP {response.status_code}")
+                return
             payload = self._read_payload(response)
             if not (200 <= response.status_code < 300):
                 detail = json.dumps(payload, ensure_ascii=False) if not isinstance(payload, str) else payload
@@ -709,8 +828,21 @@ class RunPipelineWorker(QtCore.QRunnable):
             self.signals.run_finished.emit(self.row_index, self.history_row, True, summary[:1500], [], build_url)
 
             if run_id:
-                self._poll_final_images(session, run_id)
+                self.signals.run_triggered.emit(
+                    PipelineRunState(
+                        self.row_index,
+                        self.history_row,
+                        self.org_url,
+                        self.token,
+                        self.pipeline_id,
+                        run_id,
+                        self.timeout,
+                    )
+                )
         except Exception as exc:
+            if is_unsent_request_error(exc) and self.trigger.attempts < TRIGGER_MAX_ATTEMPTS:
+                self.signals.run_retry.emit(self.trigger, self.trigger.retry_delay(), f"连接失败: {exc}")
+                return
             self.signals.run_finished.emit(self.row_index, self.history_row, False, f"执行异常: {exc}", [], "")
 
     @staticmethod
@@ -722,132 +854,394 @@ class RunPipelineWorker(QtCore.QRunnable):
 
     @staticmethod
     def _find_run_id(payload):
-        if isinstance(payload, int):
-            return str(payload)
-        if isinstance(payload, float) and payload.is_integer():
-            return str(int(payload))
-        if isinstance(payload, str) and payload.strip().isdigit():
-            return payload.strip()
-        if isinstance(payload, dict):
-            for key in ("runId", "run_id", "pipelineRunId", "buildId", "build_id", "id"):
-                value = payload.get(key)
-                if value:
-                    return str(value)
-            for value in payload.values():
-                found = RunPipelineWorker._find_run_id(value)
-                if found:
-                    return found
-        if isinstance(payload, list):
-            for value in payload:
-                found = RunPipelineWorker._find_run_id(value)
-                if found:
-                    return found
-        return ""
+        return find_run_id(payload)
 
     def _build_history_url(self, run_id):
         public_org_url = self.org_url.replace("/oapi/v1", "").rstrip("/")
         return f"{public_org_url}/flow/pipelines/{self.pipeline_id}/builds/{run_id}"
 
-    def _fetch_run_details(self, session, run_id):
-        headers = {"x-yunxiao-token": self.token}
-        candidates = [
-            f"{self.org_url}/oapi/v1/flow/pipelines/{self.pipeline_id}/runs/{run_id}",
-            f"{self.org_url}/oapi/v1/flow/pipelines/{self.pipeline_id}/runs/{run_id}/jobs",
-            f"{self.org_url}/oapi/v1/flow/pipelines/{self.pipeline_id}/runs/{run_id}/logs",
-        ]
-        payloads = []
-        for url in candidates:
-            try:
-                response = session.get(url, headers=headers, timeout=self.timeout)
-                if 200 <= response.status_code < 300:
-                    payloads.append(self._read_payload(response))
-            except Exception:
-                continue
-        return payloads
 
-    def _fetch_job_log(self, session, run_id, job_id):
-        url = f"{self.org_url}/oapi/v1/flow/pipelines/{self.pipeline_id}/runs/{run_id}/job/{job_id}/log"
-        try:
-            response = session.get(
-                url,
-                headers={"Content-Type": "application/json", "x-yunxiao-token": self.token},
-                timeout=self.timeout,
+class PipelineRunState:
+    """一次已触发流水线的镜像轮询状态，由 PipelineImagePoller 统一持有。"""
+
+    def __init__(self, row_index, history_row, org_url, token, pipeline_id, run_id, timeout=DEFAULT_TIMEOUT):
+        self.row_index = row_index
+        self.history_row = history_row
+        self.org_url = org_url.rstrip("/")
+        self.token = token
+        self.pipeline_id = pipeline_id
+        self.run_id = run_id
+        self.timeout = timeout
+        self.polls = 0
+        self.queued_polls = 0
+        self.started_at = time.monotonic()
+        self.next_poll_at = self.started_at
+        self.images = {"x86": "", "arm": ""}
+        self.job_logs = {}
+        # 任务 ID 一旦出现就不会再变，记下任务、所在接口和节点位置，之后轮询不再遍历整份返回
+        self.acr_jobs = {"x86": {}, "arm": {}}
+        self.job_paths = {}
+        self.jobs_endpoint = None
+        self.failed_endpoints = set()
+
+    def pending_arches(self):
+        return [arch for arch in ("x86", "arm") if not self.images[arch]]
+
+    def jobs_known(self):
+        return self.jobs_endpoint is not None and all(self.acr_jobs[arch] for arch in self.pending_arches())
+
+    def remember_jobs(self, endpoint, jobs, paths):
+        # 每次都来自一次完整遍历，整体替换，结构变化后不会留下旧的任务和位置
+        self.jobs_endpoint = endpoint
+        self.acr_jobs = {arch: dict(jobs[arch]) for arch in ("x86", "arm")}
+        self.job_paths = dict(paths)
+
+    def forget_jobs(self):
+        self.jobs_endpoint = None
+        self.acr_jobs = {"x86": {}, "arm": {}}
+        self.job_paths = {}
+
+    def refresh_job_statuses(self, payload):
+        """按记下的位置更新任务状态，返回结构变化导致找不到任务时返回 False。"""
+        statuses = {}
+        for jobs in self.acr_jobs.values():
+            for job_id in jobs:
+                node = node_at(payload, self.job_paths.get(job_id, ()))
+                if not isinstance(node, dict) or str(node.get("id")) != job_id:
+                    return False
+                statuses[job_id] = acr_job_status(node)
+        for jobs in self.acr_jobs.values():
+            for job_id in jobs:
+                jobs[job_id] = statuses[job_id]
+        return True
+
+    def schedule_next_poll(self, stage):
+        # 排队阶段按指数退避加抖动，构建开始后恢复固定间隔
+        if stage == "queued":
+            delay = min(IMAGE_POLL_BACKOFF_MAX_SECONDS, IMAGE_POLL_BACKOFF_BASE_SECONDS * 2 ** self.queued_polls)
+            self.queued_polls += 1
+        else:
+            delay = IMAGE_LOG_POLL_INTERVAL_SECONDS
+            self.queued_polls = 0
+        self.next_poll_at = time.monotonic() + delay * random.uniform(0.8, 1.2)
+
+    def timed_out(self):
+        return time.monotonic() - self.started_at >= IMAGE_POLL_TIMEOUT_SECONDS
+
+    def run_url(self, suffix=""):
+        return f"{self.org_url}/oapi/v1/flow/pipelines/{self.pipeline_id}/runs/{self.run_id}{suffix}"
+
+
+def fetch_run_detail(session, state, endpoint):
+    try:
+        response = session.get(state.run_url(endpoint), headers=api_headers(state.token), timeout=state.timeout)
+    except Exception:
+        return None
+    if not (200 <= response.status_code < 300):
+        # 4xx 说明该运行不支持这个接口，之后的轮询不再请求；限流和 5xx 下次重试
+        if 400 <= response.status_code < 500 and response.status_code != 429:
+            state.failed_endpoints.add(endpoint)
+        return None
+    try:
+        return RunPipelineWorker._read_payload(response)
+    except Exception:
+        return None
+
+
+def refresh_acr_jobs(session, state):
+    """
+    更新 state.acr_jobs。任务已知时只请求给出任务的那个接口并按位置读取状态，
+    待解析架构的任务都已结束则不再请求详情；否则依次查询可用接口重新查找任务。
+    """
+    if state.jobs_known():
+        unfinished = [
+            status
+            for arch in state.pending_arches()
+            for status in state.acr_jobs[arch].values()
+            if status and status not in ACR_JOB_FINISHED_STATUSES
+        ]
+        if not unfinished:
+            return
+        endpoint = state.jobs_endpoint
+        payload = fetch_run_detail(session, state, endpoint)
+        if payload is None and endpoint not in state.failed_endpoints:
+            # 限流、5xx 或网络错误只是这次没拿到，保留已知任务下次再按位置读取
+            return
+        if payload is not None and state.refresh_job_statuses(payload):
+            return
+        # 返回结构变了：对这份返回完整遍历一次，用新的任务和位置替换旧的
+        paths = {}
+        jobs = collect_acr_jobs(payload, paths) if payload is not None else {}
+        if any(jobs.values()):
+            state.remember_jobs(endpoint, jobs, paths)
+            return
+        state.forget_jobs()
+    for endpoint in RUN_DETAIL_ENDPOINTS:
+        if endpoint in state.failed_endpoints:
+            continue
+        payload = fetch_run_detail(session, state, endpoint)
+        if payload is None:
+            continue
+        paths = {}
+        jobs = collect_acr_jobs(payload, paths)
+        if any(jobs.values()):
+            state.remember_jobs(endpoint, jobs, paths)
+            LogPage.log(
+                "[云效调试] ACR jobId: "
+                f"x86={','.join(jobs['x86']) or '无'} arm={','.join(jobs['arm']) or '无'}"
             )
-            LogPage.log(f"[云效调试] 查询构建日志 job={job_id} HTTP {response.status_code}: {url}")
-            if not (200 <= response.status_code < 300):
-                LogPage.log(f"[云效调试] 构建日志返回: {response.text[:800]}")
-                return ""
-            return response.text
-        except Exception as exc:
-            LogPage.log(f"[云效调试] 查询构建日志异常 job={job_id}: {exc}")
-            return ""
+            return
 
-    def _fetch_final_images(self, session, run_id, detail_payloads):
-        job_ids = {"x86": [], "arm": []}
-        for payload in detail_payloads:
-            collected = collect_acr_job_ids(payload)
-            for arch in ("x86", "arm"):
-                for job_id in collected.get(arch, []):
-                    if job_id not in job_ids[arch]:
-                        job_ids[arch].append(job_id)
-        LogPage.log(
-            "[云效调试] ACR jobId: "
-            f"x86={','.join(job_ids['x86']) or '无'} arm={','.join(job_ids['arm']) or '无'}"
+
+def fetch_job_log(session, state, job_id):
+    """返回任务的完整构建日志，请求失败时返回 None。"""
+    url = state.run_url(f"/job/{job_id}/log")
+    try:
+        response = session.get(
+            url,
+            headers=api_headers(state.token),
+            timeout=state.timeout,
         )
+        LogPage.log(f"[云效调试] 查询构建日志 job={job_id} HTTP {response.status_code}: {url}")
+        if not (200 <= response.status_code < 300):
+            LogPage.log(f"[云效调试] 构建日志返回: {response.text[:800]}")
+            return None
+        return response.text
+    except Exception as exc:
+        LogPage.log(f"[云效调试] 查询构建日志异常 job={job_id}: {exc}")
+        return None
+
+
+def fetch_final_images(session, state):
+    """
+    返回 (镜像, 阶段)。阶段为 queued / running / finished，
+    只有 ACR 任务已结束（或接口不返回状态）时才拉取构建日志，已解析出镜像的架构不再查询。
+    """
+    refresh_acr_jobs(session, state)
+    final_images = {"x86": "", "arm": ""}
+    for arch in state.pending_arches():
+        for job_id, status in state.acr_jobs[arch].items():
+            if status and status not in ACR_JOB_FINISHED_STATUSES:
+                continue
+            text = fetch_job_log(session, state, job_id)
+            if text is None:
+                # 请求失败不能当成空日志喂给解析器，否则会重置偏移，下次成功时整份日志重新扫描
+                continue
+            parser = state.job_logs.setdefault(job_id, AcrImageLogParser())
+            parser.feed_text(text)
+            parsed = parser.images()
+            if parsed.get(arch):
+                final_images[arch] = parsed[arch]
+                LogPage.log(f"[云效调试] 解析 {arch} 镜像: {parsed[arch]}")
+                break
 
-        final_images = {"x86": "", "arm": ""}
-        for arch in ("x86", "arm"):
-            for job_id in job_ids[arch]:
-                log_text = self._fetch_job_log(session, run_id, job_id)
-                parsed = extract_final_acr_images(log_text)
-                if parsed.get(arch):
-                    final_images[arch] = parsed[arch]
-                    LogPage.log(f"[云效调试] 解析 {arch} 镜像: {parsed[arch]}")
-                    break
-        return final_images
-
-    def _poll_final_images(self, session, run_id):
-        last_images = {"x86": "", "arm": ""}
-        for poll_index in range(IMAGE_LOG_MAX_POLLS):
-            LogPage.log(f"[云效] 获取镜像中({poll_index + 1}/{IMAGE_LOG_MAX_POLLS})")
-            detail_payloads = self._fetch_run_details(session, run_id)
-            final_images = self._fetch_final_images(session, run_id, detail_payloads)
+    statuses = [status for jobs in state.acr_jobs.values() for status in jobs.values()]
+    if not statuses or all(status in ACR_JOB_QUEUED_STATUSES for status in statuses):
+        stage = "queued"
+    elif all(not status or status in ACR_JOB_FINISHED_STATUSES for status in statuses):
+        stage = "finished"
+    else:
+        stage = "running"
+    return final_images, stage
+
+
+class PollImagesWorker(QtCore.QRunnable):
+    def __init__(self, session, states):
+        super().__init__()
+        self.session = session
+        self.states = states
+        self.signals = YunxiaoSignals()
+
+    def run(self):
+        results = []
+        for state in self.states:
+            LogPage.log(f"[云效] 获取镜像中(第 {state.polls + 1} 次) runId={state.run_id}")
+            try:
+                final_images, stage = fetch_final_images(self.session, state)
+            except Exception as exc:
+                LogPage.log(f"[云效] 获取镜像异常 runId={state.run_id}: {exc}")
+                final_images, stage = {}, "running"
+            results.append((state, final_images, stage))
+        self.signals.poll_finished.emit(results)
+
+
+class PipelineImagePoller(QtCore.QObject):
+    """
+    统一轮询所有已触发流水线的镜像地址：定时器在界面线程挑出到期的运行，
+    一批交给单个线程池任务在同一个 session 上依次查询，占用线程数与运行数量无关。
+    """
+
+    images_updated = QtCore.pyqtSignal(int, int, str, str, str)
+
+    def __init__(self, thread_pool, parent=None):
+        super().__init__(parent)
+        self.thread_pool = thread_pool
+        self.runs = []
+        self.busy = False
+        self.session = get_client()
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(IMAGE_POLL_TICK_MS)
+        self.timer.timeout.connect(self.poll_due_runs)
+
+    @QtCore.pyqtSlot(object)
+    def add_run(self, state):
+        self.runs.append(state)
+        if not self.timer.isActive():
+            self.timer.start()
+        self.poll_due_runs()
+
+    def poll_due_runs(self):
+        if self.busy:
+            return
+        if not self.runs:
+            self.timer.stop()
+            return
+        now = time.monotonic()
+        due = [state for state in self.runs if state.next_poll_at <= now]
+        if not due:
+            return
+        self.busy = True
+        worker = PollImagesWorker(self.session, due)
+        worker.signals.poll_finished.connect(self.on_poll_finished)
+        self.thread_pool.start(worker)
+
+    @QtCore.pyqtSlot(list)
+    def on_poll_finished(self, results):
+        self.busy = False
+        for state, final_images, stage in results:
+            state.polls += 1
             for arch in ("x86", "arm"):
                 if final_images.get(arch):
-                    last_images[arch] = final_images[arch]
-
-            if last_images.get("x86") or last_images.get("arm"):
-                self.signals.images_updated.emit(
-                    self.row_index,
-                    self.history_row,
-                    last_images.get("x86", ""),
-                    last_images.get("arm", ""),
-                    "镜像已获取" if last_images.get("x86") and last_images.get("arm") else "部分镜像已获取",
+                    state.images[arch] = final_images[arch]
+            x86_image = state.images["x86"]
+            arm_image = state.images["arm"]
+            if x86_image or arm_image:
+                self.images_updated.emit(
+                    state.row_index,
+                    state.history_row,
+                    x86_image,
+                    arm_image,
+                    "镜像已获取" if x86_image and arm_image else "部分镜像已获取",
                 )
+            if x86_image and arm_image:
+                self.runs.remove(state)
+            elif state.timed_out():
+                self.runs.remove(state)
+                self.images_updated.emit(state.row_index, state.history_row, x86_image, arm_image, "获取镜像超时")
+            else:
+                state.schedule_next_poll(stage)
+        self.poll_due_runs()
 
-            if last_images.get("x86") and last_images.get("arm"):
-                return
 
-            if poll_index < IMAGE_LOG_MAX_POLLS - 1:
-                time.sleep(IMAGE_LOG_POLL_INTERVAL_SECONDS)
+class PipelineTriggerQueue(QtCore.QObject):
+    """
+    流水线触发队列：界面线程按并发数和每秒请求数派发 RunPipelineWorker，所有触发共用 get_client() 的连接池，
+    429/503 和连接未建立的错误按退避时间重新排队，429 时整个队列一起暂停。
+    """
+
+    run_finished = QtCore.pyqtSignal(int, int, bool, str, list, str)
+    run_triggered = QtCore.pyqtSignal(object)
+    run_status = QtCore.pyqtSignal(int, str)
+    queue_changed = QtCore.pyqtSignal(int, int)
+
+    def __init__(self, thread_pool, parent=None):
+        super().__init__(parent)
+        self.thread_pool = thread_pool
+        self.pending = []
+        self.in_flight = 0
+        self.concurrency = DEFAULT_TRIGGER_CONCURRENCY
+        self.rate = DEFAULT_TRIGGER_RATE
+        self.next_dispatch_at = 0.0
+        self.last_counts = None
+        self.session = get_client()
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(TRIGGER_TICK_MS)
+        self.timer.timeout.connect(self.dispatch)
+
+    def configure(self, concurrency, rate):
+        self.concurrency = max(1, min(MAX_TRIGGER_CONCURRENCY, int(concurrency)))
+        self.rate = max(0.1, float(rate))
+        self.dispatch()
+
+    def submit(self, trigger):
+        self.pending.append(trigger)
+        self.dispatch()
+
+    def dispatch(self):
+        now = time.monotonic()
+        while self.in_flight < self.concurrency and now >= self.next_dispatch_at:
+            trigger = next((trigger for trigger in self.pending if trigger.not_before <= now), None)
+            if trigger is None:
+                break
+            self.pending.remove(trigger)
+            self.in_flight += 1
+            # 按上一个时间槽顺延而不是从 now 算起，这样一次定时器触发可以派发多个，速率能超过每 tick 一个；
+            # 空闲之后最多补一个 tick 的量
+            slot = max(self.next_dispatch_at, now - TRIGGER_TICK_MS / 1000)
+            self.next_dispatch_at = slot + 1.0 / self.rate
+            worker = RunPipelineWorker(trigger, self.session)
+            worker.signals.run_finished.connect(self.on_run_finished)
+            worker.signals.run_retry.connect(self.on_run_retry)
+            worker.signals.run_triggered.connect(self.run_triggered)
+            self.thread_pool.start(worker)
+            self.run_status.emit(trigger.row_index, "执行中...")
+        if self.pending and not self.timer.isActive():
+            self.timer.start()
+        elif not self.pending:
+            self.timer.stop()
+        counts = (len(self.pending), self.in_flight)
+        if counts != self.last_counts:
+            self.last_counts = counts
+            self.queue_changed.emit(*counts)
 
-        self.signals.images_updated.emit(
-            self.row_index,
-            self.history_row,
-            last_images.get("x86", ""),
-            last_images.get("arm", ""),
-            "获取镜像超时",
+    @QtCore.pyqtSlot(int, int, bool, str, list, str)
+    def on_run_finished(self, row_index, history_row, success, message, images, build_url):
+        self.in_flight -= 1
+        self.run_finished.emit(row_index, history_row, success, message, images, build_url)
+        self.dispatch()
+
+    @QtCore.pyqtSlot(object, float, str)
+    def on_run_retry(self, trigger, delay, message):
+        self.in_flight -= 1
+        trigger.not_before = time.monotonic() + delay
+        if message == "HTTP 429":
+            self.next_dispatch_at = max(self.next_dispatch_at, trigger.not_before)
+        self.pending.append(trigger)
+        self.run_status.emit(trigger.row_index, "等待重试...")
+        LogPage.log(
+            f"[云效] 触发 pipeline={trigger.pipeline_id} 返回 {message}，"
+            f"{delay:.0f} 秒后重试(已尝试 {trigger.attempts}/{TRIGGER_MAX_ATTEMPTS} 次)"
         )
+        self.dispatch()
 
 
 class YunxiaoPage(QtWidgets.QWidget):
+    # HistoryStore 在后台线程写盘失败时经由这个信号回到界面线程记日志
+    history_flush_failed = QtCore.pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         self.thread_pool = QtCore.QThreadPool.globalInstance()
         self.rows = []
+        self.pipeline_pagination = {}
+        self.history_flush_failed.connect(self.on_history_flush_failed)
+        self.history_store = self.open_history_store()
+        self.history_page = 0
+        self.history_total = 0
+        self.history_filters = {}
+        self.image_poller = PipelineImagePoller(self.thread_pool, self)
+        self.image_poller.images_updated.connect(self.on_images_updated)
+        self.trigger_queue = PipelineTriggerQueue(self.thread_pool, self)
+        self.trigger_queue.run_finished.connect(self.on_run_finished)
+        self.trigger_queue.run_triggered.connect(self.image_poller.add_run)
+        self.trigger_queue.run_status.connect(self.on_trigger_run_status)
+        self.trigger_queue.queue_changed.connect(self.on_trigger_queue_changed)
         self._build_ui()
         self.load_config()
         self.load_history()
+        app = QtWidgets.QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.close_history)
 
     def _build_ui(self):
         layout = QtWidgets.QVBoxLayout(self)
@@ -876,11 +1270,24 @@ class YunxiaoPage(QtWidgets.QWidget):
         self.since_input = QtWidgets.QLineEdit(datetime.now().strftime("%Y-%m-%d 00:00"))
         self.roots_input = QtWidgets.QPlainTextEdit("\n".join(DEFAULT_ROOTS))
         self.roots_input.setFixedHeight(78)
+        self.scan_workers_input = QtWidgets.QSpinBox()
+        self.scan_workers_input.setRange(1, 32)
+        self.scan_workers_input.setValue(DEFAULT_SCAN_WORKERS)
+        self.trigger_concurrency_input = QtWidgets.QSpinBox()
+        self.trigger_concurrency_input.setRange(1, MAX_TRIGGER_CONCURRENCY)
+        self.trigger_concurrency_input.setValue(DEFAULT_TRIGGER_CONCURRENCY)
+        self.trigger_rate_input = QtWidgets.QDoubleSpinBox()
+        self.trigger_rate_input.setRange(0.1, 20.0)
+        self.trigger_rate_input.setSingleStep(0.5)
+        self.trigger_rate_input.setValue(DEFAULT_TRIGGER_RATE)
         form.addRow("云效组织地址:", self.org_url_input)
         form.addRow("YUNXIAO_TOKEN:", self.token_input)
         form.addRow("提交作者:", self.author_input)
         form.addRow("提交起始时间:", self.since_input)
         form.addRow("仓库根目录(每行一个):", self.roots_input)
+        form.addRow("扫描并发数:", self.scan_workers_input)
+        form.addRow("触发并发数:", self.trigger_concurrency_input)
+        form.addRow("每秒触发数:", self.trigger_rate_input)
         layout.addLayout(form)
 
         top_buttons = QtWidgets.QHBoxLayout()
@@ -918,6 +1325,8 @@ class YunxiaoPage(QtWidgets.QWidget):
         self.save_config_btn.clicked.connect(self.save_config)
         self.add_manual_btn.clicked.connect(self.add_manual_mapping_row)
         self.remove_manual_btn.clicked.connect(self.remove_selected_manual_rows)
+        self.trigger_concurrency_input.valueChanged.connect(self.configure_trigger_queue)
+        self.trigger_rate_input.valueChanged.connect(self.configure_trigger_queue)
 
     def _build_execute_tab(self):
         layout = QtWidgets.QVBoxLayout(self.execute_tab)
@@ -929,15 +1338,19 @@ class YunxiaoPage(QtWidgets.QWidget):
         self.branch_run_input = QtWidgets.QLineEdit()
         self.branch_run_input.setPlaceholderText("分支名")
         self.run_branch_btn = QtWidgets.QPushButton("一键执行该分支")
+        self.plan_branch_btn = QtWidgets.QPushButton("生成执行计划")
         action_buttons.addWidget(self.scan_btn)
         action_buttons.addWidget(self.run_selected_btn)
         action_buttons.addWidget(self.run_all_btn)
         action_buttons.addWidget(self.branch_run_input)
+        action_buttons.addWidget(self.plan_branch_btn)
         action_buttons.addWidget(self.run_branch_btn)
+        self.trigger_queue_label = QtWidgets.QLabel("排队 0 / 执行中 0")
+        action_buttons.addWidget(self.trigger_queue_label)
         layout.addLayout(action_buttons)
 
-        self.commit_table = CopyableTableWidget(0, 10)
-        self.commit_table.setHorizontalHeaderLabels(["时间", "工作区", "仓库", "分支", "提交", "作者", "流水线", "来源", "状态", "构建地址"])
+        self.commit_model = CommitTableModel(self)
+        self.commit_table = CopyableTableView(self.commit_model)
         self.commit_table.setColumnWidth(0, 170)
         self.commit_table.setColumnWidth(2, 170)
         self.commit_table.setColumnWidth(8, 110)
@@ -951,18 +1364,48 @@ class YunxiaoPage(QtWidgets.QWidget):
         self.run_selected_btn.clicked.connect(self.run_selected)
         self.run_all_btn.clicked.connect(self.run_all_matched)
         self.run_branch_btn.clicked.connect(self.run_branch_if_exists)
-        self.commit_table.itemDoubleClicked.connect(self.open_commit_build_url)
+        self.plan_branch_btn.clicked.connect(self.plan_branch_run)
 
     def _build_history_tab(self):
         layout = QtWidgets.QVBoxLayout(self.history_tab)
 
+        filter_layout = QtWidgets.QHBoxLayout()
+        self.history_repo_input = QtWidgets.QLineEdit()
+        self.history_repo_input.setPlaceholderText("仓库")
+        self.history_branch_input = QtWidgets.QLineEdit()
+        self.history_branch_input.setPlaceholderText("分支")
+        self.history_pipeline_input = QtWidgets.QLineEdit()
+        self.history_pipeline_input.setPlaceholderText("流水线 ID")
+        self.history_status_input = QtWidgets.QComboBox()
+        self.history_status_input.addItems(["", "执行中", "已触发", "失败"])
+        self.history_since_input = QtWidgets.QLineEdit()
+        self.history_since_input.setPlaceholderText("起始时间 YYYY-mm-dd HH:MM")
+        self.history_until_input = QtWidgets.QLineEdit()
+        self.history_until_input.setPlaceholderText("结束时间 YYYY-mm-dd HH:MM")
+        self.history_query_btn = QtWidgets.QPushButton("查询")
+        filter_layout.addWidget(self.history_repo_input)
+        filter_layout.addWidget(self.history_branch_input)
+        filter_layout.addWidget(self.history_pipeline_input)
+        filter_layout.addWidget(self.history_status_input)
+        filter_layout.addWidget(self.history_since_input)
+        filter_layout.addWidget(self.history_until_input)
+        filter_layout.addWidget(self.history_query_btn)
+        layout.addLayout(filter_layout)
+
         button_layout = QtWidgets.QHBoxLayout()
+        self.history_prev_btn = QtWidgets.QPushButton("上一页")
+        self.history_next_btn = QtWidgets.QPushButton("下一页")
+        self.history_page_label = QtWidgets.QLabel("第 1/1 页，共 0 条")
         self.clear_history_btn = QtWidgets.QPushButton("清空历史")
+        button_layout.addWidget(self.history_prev_btn)
+        button_layout.addWidget(self.history_next_btn)
+        button_layout.addWidget(self.history_page_label)
+        button_layout.addStretch()
         button_layout.addWidget(self.clear_history_btn)
         layout.addLayout(button_layout)
 
-        self.history_table = CopyableTableWidget(0, 11)
-        self.history_table.setHorizontalHeaderLabels(["执行时间", "仓库", "分支", "提交", "流水线", "来源", "状态", "构建地址", "x86镜像", "arm镜像", "返回信息"])
+        self.history_model = RecordTableModel(HISTORY_COLUMNS, url_field="build_url", key_field="record_id", parent=self)
+        self.history_table = CopyableTableView(self.history_model)
         self.history_table.setColumnWidth(0, 170)
         self.history_table.setColumnWidth(1, 190)
         self.history_table.setColumnWidth(3, 220)
@@ -975,56 +1418,88 @@ class YunxiaoPage(QtWidgets.QWidget):
         self.history_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         layout.addWidget(self.history_table)
 
+        self.history_query_btn.clicked.connect(self.query_history)
+        self.history_prev_btn.clicked.connect(lambda: self.show_history_page(self.history_page - 1))
+        self.history_next_btn.clicked.connect(lambda: self.show_history_page(self.history_page + 1))
         self.clear_history_btn.clicked.connect(self.clear_history)
-        self.history_table.itemDoubleClicked.connect(self.open_history_build_url)
-
-    def history_headers(self):
-        return [
-            self.history_table.horizontalHeaderItem(col).text()
-            for col in range(self.history_table.columnCount())
-        ]
-
-    def history_row_values(self, row):
-        return [
-            table_item_text(self.history_table.item(row, col))
-            for col in range(self.history_table.columnCount())
-        ]
-
-    def save_history(self):
-        os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
-        headers = self.history_headers()
-        rows = []
-        for row in range(self.history_table.rowCount()):
-            values = self.history_row_values(row)
-            if any(values):
-                rows.append(dict(zip(headers, values)))
-        with open(HISTORY_PATH, "w", encoding="utf-8") as file:
-            json.dump(rows, file, ensure_ascii=False, indent=4)
 
     def load_history(self):
-        if not os.path.exists(HISTORY_PATH):
-            return
+        self.show_history_page(0)
+
+    def query_history(self):
+        self.history_filters = {
+            "repo_name": self.history_repo_input.text().strip(),
+            "branch": self.history_branch_input.text().strip(),
+            "pipeline_id": self.history_pipeline_input.text().strip(),
+            "status": self.history_status_input.currentText().strip(),
+            "since": self.history_since_input.text().strip(),
+            "until": self.history_until_input.text().strip(),
+        }
+        self.show_history_page(0)
+
+    def show_history_page(self, page):
+        """只从数据库读取当前页，表格里最多 HISTORY_PAGE_SIZE 行。"""
         try:
-            with open(HISTORY_PATH, "r", encoding="utf-8") as file:
-                rows = json.load(file)
-        except Exception as exc:
+            total = self.history_store.count(self.history_filters)
+            pages = max(1, (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE)
+            page = min(max(page, 0), pages - 1)
+            records = self.history_store.query(self.history_filters, HISTORY_PAGE_SIZE, page * HISTORY_PAGE_SIZE)
+        except sqlite3.Error as exc:
             LogPage.log(f"[云效] 读取执行历史失败: {exc}")
             return
-        headers = self.history_headers()
-        self.history_table.setRowCount(0)
-        for record in rows:
-            row = self.history_table.rowCount()
-            self.history_table.insertRow(row)
-            values = [str(record.get(header, "")) for header in headers]
-            for col, value in enumerate(values):
-                if col == 7:
-                    self.history_table.setItem(row, col, build_url_item(value))
-                else:
-                    self.history_table.setItem(row, col, QtWidgets.QTableWidgetItem(value))
+        self.history_page = page
+        self.history_model.set_records(HistoryRecord(record_id=record_id, **record) for record_id, record in records)
+        self.update_history_page_label(total)
+
+    def update_history_page_label(self, total):
+        self.history_total = total
+        pages = max(1, (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE)
+        self.history_page_label.setText(f"第 {self.history_page + 1}/{pages} 页，共 {total} 条")
+        self.history_prev_btn.setEnabled(self.history_page > 0)
+        self.history_next_btn.setEnabled(self.history_page < pages - 1)
+
+    def showing_latest_history(self):
+        return self.history_page == 0 and not any(self.history_filters.values())
+
+    def save_history_fields(self, record_id, fields):
+        if not record_id:
+            return
+        # 只记到待写队列，由 HistoryStore 的后台线程合并写盘
+        try:
+            self.history_store.update(record_id, fields)
+        except HistoryStoreClosed:
+            LogPage.log(f"[云效] 执行历史已关闭，丢弃记录 {record_id} 的更新")
+            return
+        row = self.history_model.row_of(record_id)
+        if row is not None:
+            self.history_model.update_record(row, fields)
+
+    def open_history_store(self):
+        on_flush_error = lambda exc: self.history_flush_failed.emit(str(exc))  # noqa: E731
+        try:
+            return HistoryStore(
+                on_flush_error=on_flush_error,
+                on_import_error=lambda exc: LogPage.log(f"[云效] 导入旧执行历史失败，下次启动时重试: {exc}"),
+            )
+        except (OSError, sqlite3.Error) as exc:
+            LogPage.log(f"[云效] 打开执行历史失败，本次运行的记录只保存在内存中: {exc}")
+            return HistoryStore(MEMORY_DB_PATH, on_flush_error=on_flush_error)
+
+    def on_history_flush_failed(self, message):
+        LogPage.log(f"[云效] 保存执行历史失败: {message}")
 
     def clear_history(self):
-        self.history_table.setRowCount(0)
-        self.save_history()
+        try:
+            self.history_store.clear()
+        except sqlite3.Error as exc:
+            LogPage.log(f"[云效] 清空执行历史失败: {exc}")
+        self.show_history_page(0)
+
+    def close_history(self):
+        try:
+            self.history_store.close()
+        except sqlite3.Error as exc:
+            LogPage.log(f"[云效] 保存执行历史失败: {exc}")
 
     def load_config(self):
         os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
@@ -1037,6 +1512,10 @@ class YunxiaoPage(QtWidgets.QWidget):
         self.author_input.setText(data.get("author", "宇盛"))
         self.since_input.setText(data.get("since", datetime.now().strftime("%Y-%m-%d 00:00")))
         self.roots_input.setPlainText("\n".join(data.get("roots", DEFAULT_ROOTS)))
+        self.scan_workers_input.setValue(int(data.get("scan_workers", DEFAULT_SCAN_WORKERS)))
+        self.trigger_concurrency_input.setValue(int(data.get("trigger_concurrency", DEFAULT_TRIGGER_CONCURRENCY)))
+        self.trigger_rate_input.setValue(float(data.get("trigger_rate", DEFAULT_TRIGGER_RATE)))
+        self.pipeline_pagination = data.get("pipeline_pagination", {})
 
         manual_mappings = data.get("manual_mappings", data.get("mappings", []))
         self.manual_mapping_table.setRowCount(0)
@@ -1047,15 +1526,22 @@ class YunxiaoPage(QtWidgets.QWidget):
         for item in data.get("automatic_mappings", []):
             self.add_auto_mapping_row(item)
 
-    def save_config(self):
-        data = {
+    def config_data(self):
+        return {
             "org_url": self.org_url_input.text().strip(),
             "author": self.author_input.text().strip(),
             "since": self.since_input.text().strip(),
             "roots": self.roots(),
+            "scan_workers": self.scan_workers_input.value(),
+            "trigger_concurrency": self.trigger_concurrency_input.value(),
+            "trigger_rate": self.trigger_rate_input.value(),
+            "pipeline_pagination": self.pipeline_pagination,
             "manual_mappings": self.manual_mappings(),
             "automatic_mappings": self.automatic_mappings(),
         }
+
+    def save_config(self):
+        data = self.config_data()
         with open(CONFIG_PATH, "w", encoding="utf-8") as file:
             json.dump(data, file, ensure_ascii=False, indent=4)
         QtWidgets.QMessageBox.information(self, "保存", f"配置已保存到 {CONFIG_PATH}\nToken 不会写入配置文件。")
@@ -1064,13 +1550,34 @@ class YunxiaoPage(QtWidgets.QWidget):
         token = self.token_input.text().strip() or load_yunxiao_token()
         self.update_pipeline_btn.setEnabled(False)
         LogPage.log("[云效] 开始通过 OpenAPI 更新流水线映射")
-        worker = FetchPipelineMappingsWorker(self.org_url_input.text().strip() or DEFAULT_ORG_URL, token, self.roots())
+        worker = FetchPipelineMappingsWorker(
+            self.org_url_input.text().strip() or DEFAULT_ORG_URL,
+            token,
+            self.roots(),
+            self.pipeline_pagination,
+        )
+        worker.signals.mappings_progress.connect(self.on_pipeline_mappings_progress)
+        worker.signals.pagination_detected.connect(self.on_pipeline_pagination_detected)
         worker.signals.mappings_finished.connect(self.on_pipeline_mappings_finished)
         self.thread_pool.start(worker)
 
+    @QtCore.pyqtSlot(int, int)
+    def on_pipeline_mappings_progress(self, done, total):
+        self.update_pipeline_btn.setText(f"更新中 {done}/{total}")
+
+    @QtCore.pyqtSlot(dict)
+    def on_pipeline_pagination_detected(self, pagination):
+        if pagination != self.pipeline_pagination:
+            if pagination.get("single_page"):
+                LogPage.log("[云效] 流水线列表不分页，之后刷新不再探测分页参数")
+            else:
+                LogPage.log(f"[云效] 流水线列表分页参数: {pagination.get('page_key')}/{pagination.get('size_key')}")
+        self.pipeline_pagination = pagination
+
     @QtCore.pyqtSlot(list, str)
     def on_pipeline_mappings_finished(self, mappings, error):
         self.update_pipeline_btn.setEnabled(True)
+        self.update_pipeline_btn.setText("更新流水线")
         if error:
             LogPage.log(f"[云效] 更新流水线映射失败: {error}")
             QtWidgets.QMessageBox.warning(self, "云效", f"更新流水线映射失败:\n{error}")
@@ -1083,14 +1590,7 @@ class YunxiaoPage(QtWidgets.QWidget):
         QtWidgets.QMessageBox.information(self, "云效", f"已更新 {len(mappings)} 条 OpenAPI 映射")
 
     def save_config_silently(self):
-        data = {
-            "org_url": self.org_url_input.text().strip(),
-            "author": self.author_input.text().strip(),
-            "since": self.since_input.text().strip(),
-            "roots": self.roots(),
-            "manual_mappings": self.manual_mappings(),
-            "automatic_mappings": self.automatic_mappings(),
-        }
+        data = self.config_data()
         with open(CONFIG_PATH, "w", encoding="utf-8") as file:
             json.dump(data, file, ensure_ascii=False, indent=4)
 
@@ -1151,9 +1651,14 @@ class YunxiaoPage(QtWidgets.QWidget):
                 )
         return result
 
+    def set_scanning(self, scanning):
+        # 扫描中提交表还会插入行，排队的触发记着行号，这时执行会把状态写到别的行上
+        for button in (self.scan_btn, self.run_selected_btn, self.run_all_btn, self.run_branch_btn):
+            button.setEnabled(not scanning)
+
     def scan_commits(self):
-        self.scan_btn.setEnabled(False)
-        self.commit_table.setRowCount(0)
+        self.set_scanning(True)
+        self.commit_model.set_records([])
         self.rows = []
         LogPage.log("[云效] 开始扫描本地最近提交")
         worker = ScanCommitsWorker(
@@ -1162,32 +1667,36 @@ class YunxiaoPage(QtWidgets.QWidget):
             self.since_input.text().strip(),
             self.manual_mappings(),
             self.automatic_mappings(),
+            self.scan_workers_input.value(),
         )
+        worker.signals.scan_progress.connect(self.on_scan_progress)
         worker.signals.scan_finished.connect(self.on_scan_finished)
         self.thread_pool.start(worker)
 
+    @QtCore.pyqtSlot(list)
+    def on_scan_progress(self, rows):
+        for row_data in rows:
+            committed_at = row_data.get("committed_at", "")
+            position = len(self.rows)
+            for index, existing in enumerate(self.rows):
+                if existing.get("committed_at", "") < committed_at:
+                    position = index
+                    break
+            if position >= SCAN_RESULT_LIMIT:
+                continue
+            self.rows.insert(position, row_data)
+            self.commit_model.insert_record(position, commit_record(row_data))
+            if len(self.rows) > SCAN_RESULT_LIMIT:
+                self.rows.pop()
+                self.commit_model.remove_rows_from(SCAN_RESULT_LIMIT)
+
     @QtCore.pyqtSlot(list, str)
     def on_scan_finished(self, rows, errors):
-        self.scan_btn.setEnabled(True)
-        self.rows = rows
-        self.commit_table.setRowCount(0)
-        for row_data in rows:
-            row = self.commit_table.rowCount()
-            self.commit_table.insertRow(row)
-            values = [
-                row_data.get("committed_at", ""),
-                row_data.get("workspace", ""),
-                row_data.get("repo_name", ""),
-                row_data.get("branch", ""),
-                f"{row_data.get('short_hash', '')} {row_data.get('subject', '')}",
-                row_data.get("author", ""),
-                row_data.get("pipeline_id", "") or "未匹配",
-                row_data.get("pipeline_source", ""),
-                "待执行" if row_data.get("pipeline_id") else "缺少映射",
-                "",
-            ]
-            for col, value in enumerate(values):
-                self.commit_table.setItem(row, col, QtWidgets.QTableWidgetItem(value))
+        self.set_scanning(False)
+        # 增量插入的结果通常已与最终结果一致，只有同一时间的提交顺序不同时才重建
+        if rows != self.rows:
+            self.rows = rows
+            self.commit_model.set_records(commit_record(row_data) for row_data in rows)
 
         LogPage.log(f"[云效] 扫描完成，共 {len(rows)} 条提交")
         if errors:
@@ -1200,14 +1709,6 @@ class YunxiaoPage(QtWidgets.QWidget):
             return
         self.run_rows(rows)
 
-    def open_commit_build_url(self, item):
-        if item.column() == 9:
-            open_url_from_table_item(item)
-
-    def open_history_build_url(self, item):
-        if item.column() == 7:
-            open_url_from_table_item(item)
-
     def run_all_matched(self):
         rows = []
         seen = set()
@@ -1230,62 +1731,65 @@ class YunxiaoPage(QtWidgets.QWidget):
             return
         self.run_rows(rows)
 
-    def run_branch_if_exists(self):
+    def build_branch_plan(self):
         branch = normalize_branch_name(self.branch_run_input.text())
         if not branch:
             QtWidgets.QMessageBox.warning(self, "云效", "请输入分支名")
-            return
-
-        rows = []
-        errors = []
-        seen = set()
-        for root in self.roots():
-            if not os.path.isdir(root):
-                errors.append(f"目录不存在: {root}")
-                continue
-            for current, dirs, _files in os.walk(root):
-                if ".git" not in dirs:
-                    if current.count(os.sep) - root.count(os.sep) >= 2:
-                        dirs[:] = []
-                    continue
-                repo = current
-                dirs[:] = []
-                try:
-                    if not repo_has_branch(repo, branch):
-                        continue
-                    repo_name = os.path.basename(repo)
-                    workspace = os.path.basename(os.path.dirname(repo))
-                    remote_url = normalize_yunxiao_codeup_url(run_git(repo, ["remote", "get-url", "origin"]))
-                    key = (normalize_for_match(remote_url), branch)
-                    if key in seen:
-                        continue
-                    seen.add(key)
-                    pipeline_id, pipeline_source = match_pipeline(
-                        remote_url,
-                        repo_name,
-                        self.manual_mappings(),
-                        self.automatic_mappings(),
-                    )
-                    rows.append(
-                        {
-                            "committed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "workspace": workspace,
-                            "repo_name": repo_name,
-                            "repo_path": repo,
-                            "remote_url": remote_url,
-                            "branch": branch,
-                            "short_hash": "",
-                            "author": "",
-                            "subject": "手动指定分支执行",
-                            "pipeline_id": pipeline_id,
-                            "pipeline_source": pipeline_source,
-                        }
-                    )
-                except Exception as exc:
-                    errors.append(f"{repo}: {exc}")
-
+            return None
+        plan = build_branch_plan(
+            self.roots(),
+            branch,
+            self.manual_mappings(),
+            self.automatic_mappings(),
+            self.org_url_input.text().strip() or DEFAULT_ORG_URL,
+            self.trigger_rate_input.value(),
+        )
+        errors = [f"目录不存在: {root}" for root in plan["missing_roots"]]
+        errors.extend(f"{error['path']}: 读取 origin 失败: {error['error']}" for error in plan.get("origin_errors", []))
+        errors.extend(f"{error['path']}: {error['error']}" for error in plan["errors"])
         if errors:
             LogPage.log("[云效] 分支扫描警告:\n" + "\n".join(errors))
+        try:
+            save_branch_plan(plan)
+        except OSError as exc:
+            LogPage.log(f"[云效] 保存执行计划失败: {exc}")
+        totals = plan["totals"]
+        LogPage.log(
+            f"[云效] 执行计划 branch={branch}: 存在分支 {totals['runs'] + totals['unmatched']} 个，"
+            f"已匹配 {totals['runs']} 个，未匹配 {totals['unmatched']} 个，"
+            f"耗时 {plan['planning_seconds']:.3f}s，计划文件 {PLAN_PATH}"
+        )
+        return plan
+
+    def plan_branch_run(self):
+        plan = self.build_branch_plan()
+        if plan is not None:
+            LogPage.log(json.dumps(plan, ensure_ascii=False, indent=2))
+
+    def run_branch_if_exists(self):
+        plan = self.build_branch_plan()
+        if plan is None:
+            return
+        branch = plan["branch"]
+        committed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = []
+        for repo in plan["runs"] + plan["unmatched"]:
+            pipeline_id = repo.get("pipeline_id", "")
+            rows.append(
+                {
+                    "committed_at": committed_at,
+                    "workspace": repo["workspace"],
+                    "repo_name": repo["repo_name"],
+                    "repo_path": repo["path"],
+                    "remote_url": repo["remote_url"],
+                    "branch": branch,
+                    "short_hash": "",
+                    "author": "",
+                    "subject": "手动指定分支执行",
+                    "pipeline_id": pipeline_id,
+                    "pipeline_source": pipeline_source_label(repo["source"], repo["pipeline_name"]) if pipeline_id else "",
+                }
+            )
 
         matched_rows = [row for row in rows if row.get("pipeline_id")]
         if not matched_rows:
@@ -1295,7 +1799,8 @@ class YunxiaoPage(QtWidgets.QWidget):
         reply = QtWidgets.QMessageBox.question(
             self,
             "确认执行",
-            f"找到 {len(rows)} 个存在分支的项目，其中 {len(matched_rows)} 个已匹配流水线。\n确定执行分支 {branch} 吗？",
+            f"找到 {len(rows)} 个存在分支的项目，其中 {len(matched_rows)} 个已匹配流水线，"
+            f"按当前限速至少需要 {plan['estimate'].get('min_seconds', 0):.0f} 秒触发完。\n确定执行分支 {branch} 吗？",
             QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
             QtWidgets.QMessageBox.No,
         )
@@ -1303,24 +1808,7 @@ class YunxiaoPage(QtWidgets.QWidget):
             return
 
         self.rows = rows
-        self.commit_table.setRowCount(0)
-        for row_data in rows:
-            row = self.commit_table.rowCount()
-            self.commit_table.insertRow(row)
-            values = [
-                row_data.get("committed_at", ""),
-                row_data.get("workspace", ""),
-                row_data.get("repo_name", ""),
-                row_data.get("branch", ""),
-                row_data.get("subject", ""),
-                row_data.get("author", ""),
-                row_data.get("pipeline_id", "") or "未匹配",
-                row_data.get("pipeline_source", ""),
-                "待执行" if row_data.get("pipeline_id") else "缺少映射",
-                "",
-            ]
-            for col, value in enumerate(values):
-                self.commit_table.setItem(row, col, QtWidgets.QTableWidgetItem(value))
+        self.commit_model.set_records(commit_record(row_data) for row_data in rows)
 
         self.run_rows([index for index, row in enumerate(self.rows) if row.get("pipeline_id")])
 
@@ -1336,28 +1824,37 @@ class YunxiaoPage(QtWidgets.QWidget):
             if not pipeline_id:
                 self.set_commit_status(row_index, "缺少流水线映射", False)
                 continue
-            self.set_commit_status(row_index, "执行中...", None)
+            self.set_commit_status(row_index, "排队中...", None)
             history_row = self.add_history_row(row_data, "执行中", "", "")
             LogPage.log(
                 f"[云效] 触发流水线 pipeline={pipeline_id} repo={row_data.get('repo_name')} branch={row_data.get('branch')}"
             )
-            worker = RunPipelineWorker(
-                row_index,
-                history_row,
-                self.org_url_input.text().strip() or DEFAULT_ORG_URL,
-                token,
-                pipeline_id,
-                row_data.get("remote_url", ""),
-                row_data.get("branch", ""),
+            self.trigger_queue.submit(
+                PipelineTrigger(
+                    row_index,
+                    history_row,
+                    self.org_url_input.text().strip() or DEFAULT_ORG_URL,
+                    token,
+                    pipeline_id,
+                    row_data.get("remote_url", ""),
+                    row_data.get("branch", ""),
+                )
             )
-            worker.signals.run_finished.connect(self.on_run_finished)
-            worker.signals.images_updated.connect(self.on_images_updated)
-            self.thread_pool.start(worker)
+
+    def configure_trigger_queue(self):
+        self.trigger_queue.configure(self.trigger_concurrency_input.value(), self.trigger_rate_input.value())
+
+    @QtCore.pyqtSlot(int, str)
+    def on_trigger_run_status(self, row_index, text):
+        self.set_commit_status(row_index, text, None)
+
+    @QtCore.pyqtSlot(int, int)
+    def on_trigger_queue_changed(self, queued, in_flight):
+        self.trigger_queue_label.setText(f"排队 {queued} / 执行中 {in_flight}")
 
     @QtCore.pyqtSlot(int, int, bool, str, list, str)
     def on_run_finished(self, row_index, history_row, success, message, images, build_url):
-        self.set_commit_status(row_index, "已触发" if success else "失败", success)
-        self.commit_table.setItem(row_index, 9, build_url_item(build_url))
+        self.set_commit_status(row_index, "已触发" if success else "失败", success, build_url)
         self.update_history_row(history_row, "已触发" if success else "失败", build_url, "", "", message)
         if success:
             LogPage.log(f"[云效] 执行成功: {message}")
@@ -1368,11 +1865,7 @@ class YunxiaoPage(QtWidgets.QWidget):
 
     @QtCore.pyqtSlot(int, int, str, str, str)
     def on_images_updated(self, row_index, history_row, x86_image, arm_image, message):
-        if 0 <= history_row < self.history_table.rowCount():
-            self.history_table.setItem(history_row, 8, QtWidgets.QTableWidgetItem(x86_image))
-            self.history_table.setItem(history_row, 9, QtWidgets.QTableWidgetItem(arm_image))
-            self.history_table.setItem(history_row, 10, QtWidgets.QTableWidgetItem(message))
-            self.save_history()
+        self.save_history_fields(history_row, {"x86_image": x86_image, "arm_image": arm_image, "message": message})
         if x86_image:
             LogPage.log(f"[云效] x86镜像: {x86_image}")
         if arm_image:
@@ -1380,43 +1873,46 @@ class YunxiaoPage(QtWidgets.QWidget):
         LogPage.log(f"[云效] {message}")
 
     def add_history_row(self, row_data, status, build_url, message):
-        row = self.history_table.rowCount()
-        self.history_table.insertRow(row)
-        values = [
-            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            row_data.get("repo_name", ""),
-            row_data.get("branch", ""),
-            f"{row_data.get('short_hash', '')} {row_data.get('subject', '')}",
-            row_data.get("pipeline_id", ""),
-            row_data.get("pipeline_source", ""),
-            status,
-            build_url,
-            "",
-            "",
-            message,
-        ]
-        for col, value in enumerate(values):
-            if col == 7:
-                self.history_table.setItem(row, col, build_url_item(value))
-            else:
-                self.history_table.setItem(row, col, QtWidgets.QTableWidgetItem(value))
-        self.save_history()
-        return row
+        """写入一条执行历史并返回记录 ID，之后的状态和镜像更新都按这个 ID 写回，写盘在后台合并进行。"""
+        record = {
+            "executed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "repo_name": row_data.get("repo_name", ""),
+            "branch": row_data.get("branch", ""),
+            "commit_summary": f"{row_data.get('short_hash', '')} {row_data.get('subject', '')}",
+            "pipeline_id": row_data.get("pipeline_id", ""),
+            "pipeline_source": row_data.get("pipeline_source", ""),
+            "status": status,
+            "build_url": build_url,
+            "x86_image": "",
+            "arm_image": "",
+            "message": message,
+        }
+        try:
+            record_id = self.history_store.add(record)
+        except HistoryStoreClosed:
+            LogPage.log(f"[云效] 执行历史已关闭，未记录 {record['repo_name']} 的执行")
+            return 0  # 记录 ID 从 1 开始，0 表示没有记录
+        # 正在看第一页且没有筛选时把新记录插到最上面，超出一页的挤掉最后一行；否则不打断当前查询
+        if self.showing_latest_history():
+            self.history_model.insert_record(0, HistoryRecord(record_id=record_id, **record))
+            self.history_model.remove_rows_from(HISTORY_PAGE_SIZE)
+            self.update_history_page_label(self.history_total + 1)
+        return record_id
+
+    def update_history_row(self, record_id, status, build_url, x86_image, arm_image, message):
+        self.save_history_fields(
+            record_id,
+            {
+                "status": status,
+                "build_url": build_url,
+                "x86_image": x86_image,
+                "arm_image": arm_image,
+                "message": message,
+            },
+        )
 
-    def update_history_row(self, row, status, build_url, x86_image, arm_image, message):
-        if row < 0 or row >= self.history_table.rowCount():
-            return
-        self.history_table.setItem(row, 6, QtWidgets.QTableWidgetItem(status))
-        self.history_table.setItem(row, 7, build_url_item(build_url))
-        self.history_table.setItem(row, 8, QtWidgets.QTableWidgetItem(x86_image))
-        self.history_table.setItem(row, 9, QtWidgets.QTableWidgetItem(arm_image))
-        self.history_table.setItem(row, 10, QtWidgets.QTableWidgetItem(message))
-        self.save_history()
-
-    def set_commit_status(self, row_index, text, success):
-        item = QtWidgets.QTableWidgetItem(text)
-        if success is True:
-            item.setForeground(QtCore.Qt.darkGreen)
-        elif success is False:
-            item.setForeground(QtCore.Qt.red)
-        self.commit_table.setItem(row_index, 8, item)
+    def set_commit_status(self, row_index, text, success, build_url=None):
+        values = {"status": text, "status_ok": success}
+        if build_url is not None:
+            values["build_url"] = build_url
+        self.commit_model.update_record(row_index, values)
@@ -0,0 +1,62 @@
+import re
+from functools import lru_cache
+from urllib.parse import urlparse
+
+
+# 扫描、映射刷新和匹配时反复处理同一批地址，规范化结果按字符串缓存
+URL_CACHE_SIZE = 4096
+SCP_REMOTE_PATTERN = re.compile(r"git@([^:]+):(.+)")
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def normalize_remote_url(remote_url):
+    remote_url = (remote_url or "").strip()
+    if remote_url.startswith("git@"):
+        match = SCP_REMOTE_PATTERN.match(remote_url)
+        if match:
+            return f"https://{match.group(1)}/{match.group(2)}"
+    if remote_url.startswith("ssh://git@"):
+        parsed = urlparse(remote_url)
+        path = parsed.path.lstrip("/")
+        return f"https://{parsed.hostname}/{path}"
+    return remote_url
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def normalize_yunxiao_codeup_url(remote_url):
+    remote_url = normalize_remote_url(remote_url)
+    parsed = urlparse(remote_url)
+    if not parsed.scheme or not parsed.netloc:
+        return remote_url
+    path = parsed.path
+    if "devops.aliyuncs.com" in parsed.netloc and path.startswith("/codeup/sovell/"):
+        path = path.replace("/codeup/sovell/", "/codeup/", 1)
+        return parsed._replace(path=path).geturl()
+    return remote_url
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def normalize_for_match(value):
+    value = normalize_yunxiao_codeup_url(value or "").lower().rstrip("/")
+    if value.endswith(".git"):
+        value = value[:-4]
+    return value
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def repo_path_from_remote(remote_url):
+    normalized = normalize_yunxiao_codeup_url(remote_url)
+    parsed = urlparse(normalized)
+    path = parsed.path.lstrip("/") if parsed.path else normalized
+    path = path.lower().rstrip("/")
+    if path.endswith(".git"):
+        path = path[:-4]
+    return path
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def repo_name_from_text(value):
+    normalized = normalize_for_match(value)
+    if not normalized:
+        return ""
+    return normalized.split("/")[-1]